@@ -0,0 +1,116 @@
+""" Booking throughput of SQLite with 1, 4 and 8 worker processes.
+
+Every worker books lessons like the booking views do: a conflict check and
+an insert in one transaction. The benchmark runs on a temporary database
+for both SQLite profiles (see SQLITE_PROFILES in settings.py):
+
+    python -m benchmarks.booking_concurrency [--bookings 200] [--workers 1 4 8]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from multiprocessing import get_context
+from pathlib import Path
+
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+def setup_django():
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'spacepython.settings')
+    os.environ.setdefault('SECRET_KEY', 'benchmark')
+    # the shared tier of CACHES in process memory, unless given explicitly
+    os.environ.setdefault('CACHE_URL', 'locmemcache://')
+    # pages render without collectstatic (see static_bytes for the manifest)
+    os.environ.setdefault('STATIC_COMPRESSED', 'False')
+    sys.path.insert(0, str(BASE_DIR))
+    import django
+    django.setup()
+
+
+def book(args):
+    worker, bookings, student_id, barrier = args
+    setup_django()
+    from django.db import OperationalError, connection, transaction
+    from main_app.models import Lesson
+
+    connection.ensure_connection()
+    barrier.wait()  # all workers are ready
+    started = time.time()
+    booked = locked = 0
+    first_day = date.today() + timedelta(days=400)
+    for i in range(bookings):
+        slot = worker * bookings + i
+        day = first_day + timedelta(days=slot // 15)
+        hour = 8 + slot % 15
+        try:
+            with transaction.atomic():
+                if not Lesson.objects.filter(date=day,
+                                             time=f'{hour}:00').exists():
+                    Lesson.objects.create(student_id=student_id, date=day,
+                                          time=f'{hour}:00', salary=1000)
+            booked += 1
+        except OperationalError:
+            locked += 1
+    return booked, locked, started, time.time()
+
+
+def run(profile, workers, bookings):
+    """ Runs in a fresh process: the profile is read by settings.py """
+
+    setup_django()
+    from django.core.management import call_command
+    from main_app.models import User
+
+    call_command('migrate', verbosity=0)
+    student_id = User.objects.create(username='benchmark').pk
+
+    context = get_context('spawn')
+    with context.Manager() as manager, context.Pool(workers) as pool:
+        barrier = manager.Barrier(workers)
+        results = pool.map(book, [
+            (worker, bookings // workers, student_id, barrier)
+            for worker in range(workers)
+        ])
+    elapsed = (max(result[3] for result in results)
+               - min(result[2] for result in results))
+    booked = sum(result[0] for result in results)
+    locked = sum(result[1] for result in results)
+    print(f'{profile:<11} {workers:>7} {booked:>7} {locked:>7} '
+          f'{booked / elapsed:>10.1f}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--bookings', type=int, default=240,
+                        help='total bookings for every run')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4, 8])
+    parser.add_argument('--run', nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        run(args.run[0], int(args.run[1]), args.bookings)
+        return
+
+    print(f'{"profile":<11} {"workers":>7} {"booked":>7} {"locked":>7} '
+          f'{"booked/s":>10}')
+    for profile in ('default', 'production'):
+        for workers in args.workers:
+            with tempfile.TemporaryDirectory() as directory:
+                env = dict(os.environ, SQLITE_PROFILE=profile,
+                           SQLITE_PATH=os.path.join(directory, 'db.sqlite3'))
+                subprocess.run(
+                    [sys.executable, '-m', 'benchmarks.booking_concurrency',
+                     '--bookings', str(args.bookings),
+                     '--run', profile, str(workers)],
+                    cwd=BASE_DIR, env=env, check=True
+                )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+""" Rendering time of the main page with 500 cards (lessons and blocks).
+
+The benchmark runs on a temporary database in a fresh process. The first
+request of every user warms up the template cache and is not measured:
+
+    python -m benchmarks.render_schedule [--cards 500] [--repeat 20]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, time as dt_time, timedelta
+
+from .booking_concurrency import BASE_DIR, setup_django
+
+
+def run(cards, repeat):
+    setup_django()
+    from django.core.management import call_command
+    from django.test import Client
+    from main_app.models import Lesson, TimeBlock, User, UserDetail
+    from spacepython.constraints import C_datedelta
+
+    call_command('migrate', verbosity=0)
+    admin = User.objects.create_user(username='admin', is_staff=True,
+                                     is_superuser=True)
+    students = []
+    for i in range(20):
+        student = User.objects.create_user(username=f'student{i}',
+                                           first_name=f'Student {i}')
+        UserDetail.objects.create(user=student, alias=f'alias {i}',
+                                  telegram=f'@student{i}')
+        students.append(student)
+
+    days = C_datedelta.days + 1
+    blocks = cards // 10
+    TimeBlock.objects.bulk_create([
+        TimeBlock(date=date.today() + timedelta(days=i % days),
+                  start_time=dt_time(8), end_time=dt_time(9))
+        for i in range(blocks)
+    ])
+    Lesson.objects.bulk_create([
+        Lesson(student=students[i % len(students)],
+               date=date.today() + timedelta(days=i % days),
+               time=dt_time(9 + i % 14, (i // days) % 60), salary=1000)
+        for i in range(cards - blocks)
+    ])
+
+    for name, user in (('anonymous', None), ('student', students[0]),
+                       ('admin', admin)):
+        client = Client()
+        if user:
+            client.force_login(user)
+        client.get('/')  # warmup
+        started = time.perf_counter()
+        for _i in range(repeat):
+            response = client.get('/')
+        elapsed = (time.perf_counter() - started) / repeat
+        assert response.status_code == 200
+        print(f'{name:<10} {cards:>6} {elapsed * 1000:>10.1f} '
+              f'{len(response.content) // 1024:>8}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--cards', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--run', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        run(args.cards, args.repeat)
+        return
+
+    print(f'{"user":<10} {"cards":>6} {"ms/page":>10} {"KiB":>8}')
+    with tempfile.TemporaryDirectory() as directory:
+        env = dict(os.environ, URL_PREFIX='',
+                   SQLITE_PATH=os.path.join(directory, 'db.sqlite3'))
+        subprocess.run(
+            [sys.executable, '-m', 'benchmarks.render_schedule', '--run',
+             '--cards', str(args.cards), '--repeat', str(args.repeat)],
+            cwd=BASE_DIR, env=env, check=True
+        )
+
+
+if __name__ == '__main__':
+    main()
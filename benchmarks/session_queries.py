@@ -0,0 +1,75 @@
+""" Database queries of a logged-in student's page views by session backend.
+
+Every backend (SESSION_BACKEND in settings.py) runs in a fresh process on a
+temporary database. The first view of every page warms up the caches, the
+second one is measured:
+
+    python -m benchmarks.session_queries [--backends db cached_db ...]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+from datetime import date, time, timedelta
+
+from .booking_concurrency import BASE_DIR, setup_django
+
+
+PAGES = ('/', '/my-lessons', '/add-lesson')
+
+
+def run(backend):
+    """ Runs in a fresh process: the backend is read by settings.py """
+
+    setup_django()
+    from django.core.management import call_command
+    from django.db import connection
+    from django.test import Client
+    from django.test.utils import CaptureQueriesContext
+    from main_app.models import Lesson, User, UserDetail
+
+    call_command('migrate', verbosity=0)
+    student = User.objects.create_user(username='student', password='student')
+    UserDetail.objects.create(user=student, phone='79990000000')
+    Lesson.objects.create(student=student,
+                          date=date.today() + timedelta(days=1),
+                          time=time(15), salary=1000)
+
+    client = Client()
+    client.login(username='student', password='student')
+    for page in PAGES:
+        client.get(page)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(page)
+        assert response.status_code == 200, (page, response.status_code)
+        session = sum('django_session' in query['sql'] for query in queries)
+        print(f'{backend:<15} {page:<12} {len(queries):>7} {session:>7}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--backends', nargs='+',
+                        default=['db', 'cached_db', 'signed_cookies'])
+    parser.add_argument('--run', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        run(args.run)
+        return
+
+    print(f'{"backend":<15} {"page":<12} {"queries":>7} {"session":>7}')
+    for backend in args.backends:
+        with tempfile.TemporaryDirectory() as directory:
+            env = dict(os.environ, SESSION_BACKEND=backend, URL_PREFIX='',
+                       SQLITE_PATH=os.path.join(directory, 'db.sqlite3'))
+            subprocess.run(
+                [sys.executable, '-m', 'benchmarks.session_queries',
+                 '--run', backend],
+                cwd=BASE_DIR, env=env, check=True
+            )
+
+
+if __name__ == '__main__':
+    main()
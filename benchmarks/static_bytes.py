@@ -0,0 +1,85 @@
+""" Bytes transferred for the main page and its static files.
+
+collectstatic runs into a temporary STATIC_ROOT for both static modes
+(STATIC_COMPRESSED in settings.py), then the page and every local asset it
+references are requested through whitenoise with and without compression:
+
+    python -m benchmarks.static_bytes [--budget 300000]
+
+With --budget the check fails when the compressed total (brotli or gzip)
+exceeds the given amount of bytes. """
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import tempfile
+
+from .booking_concurrency import BASE_DIR, setup_django
+
+
+ENCODINGS = ('identity', 'gzip', 'br')
+
+
+def run():
+    """ Runs in a fresh process: the static mode is read by settings.py """
+
+    setup_django()
+    from django.conf import settings
+    from django.core.management import call_command
+    from django.test import Client
+
+    call_command('migrate', verbosity=0)
+    call_command('collectstatic', interactive=False, verbosity=0)
+
+    client = Client()
+    page = client.get('/').content
+    assets = sorted(set(re.findall(
+        r'''["'](%s[^"'?#]+)''' % re.escape(settings.STATIC_URL),
+        page.decode()
+    )))
+    totals = dict.fromkeys(ENCODINGS, len(page))
+    immutable = 0
+    for url in assets:
+        for encoding in ENCODINGS:
+            response = client.get(url, HTTP_ACCEPT_ENCODING=encoding)
+            assert response.status_code == 200, url
+            totals[encoding] += sum(map(len, response.streaming_content))
+        immutable += 'immutable' in response.get('Cache-Control', '')
+    print(f'{"compressed" if settings.STATIC_COMPRESSED else "default":<11} '
+          f'{len(assets):>6} {immutable:>9} '
+          + ' '.join(f'{totals[encoding]:>10}' for encoding in ENCODINGS))
+    return min(totals['gzip'], totals['br'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--budget', type=int,
+                        help='maximum compressed bytes of the page')
+    parser.add_argument('--run', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        total = run()
+        if args.budget and total > args.budget:
+            sys.exit(f'{total} bytes exceed the budget of {args.budget}')
+        return
+
+    print(f'{"static":<11} {"assets":>6} {"immutable":>9} '
+          + ' '.join(f'{encoding:>10}' for encoding in ENCODINGS))
+    for compressed in ('False', 'True'):
+        with tempfile.TemporaryDirectory() as directory:
+            env = dict(os.environ, URL_PREFIX='', DEBUG='False',
+                       STATIC_COMPRESSED=compressed,
+                       STATIC_ROOT=os.path.join(directory, 'static'),
+                       SQLITE_PATH=os.path.join(directory, 'db.sqlite3'))
+            command = [sys.executable, '-m', 'benchmarks.static_bytes',
+                       '--run']
+            if args.budget and compressed == 'True':
+                command += ['--budget', str(args.budget)]
+            subprocess.run(command, cwd=BASE_DIR, env=env, check=True)
+
+
+if __name__ == '__main__':
+    main()
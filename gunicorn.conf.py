@@ -0,0 +1,59 @@
+""" gunicorn settings, read from the working directory by default:
+
+    gunicorn spacepython.wsgi:application
+
+Every value may be overridden by the GUNICORN_* environment variables. """
+
+import multiprocessing
+import os
+
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('GUNICORN_WORKERS',
+                             multiprocessing.cpu_count() * 2 + 1))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 60))
+graceful_timeout = 30
+keepalive = 5
+
+# workers are forked from the master with imported Django and warmed up
+# templates, so they start fast and share the memory pages
+preload_app = True
+# restart workers from time to time, jitter spreads the restarts
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 100))
+
+accesslog = os.environ.get('GUNICORN_ACCESSLOG', None)
+
+
+def when_ready(server):
+    from spacepython.warmup import warmup_app
+    warmup_app()
+
+
+def post_worker_init(worker):
+    """ Opens database connections in every thread of the worker """
+
+    import threading
+    from spacepython.warmup import warmup_connections
+
+    pool = getattr(worker, 'tpool', None)
+    if pool is None:  # sync worker
+        warmup_connections()
+        return
+    barrier = threading.Barrier(worker.cfg.threads)
+
+    def warmup_thread():
+        # every thread waits for the others, so each task gets own thread
+        barrier.wait(timeout=10)
+        warmup_connections()
+
+    futures = [pool.submit(warmup_thread)
+               for _ in range(worker.cfg.threads)]
+    for future in futures:
+        try:
+            future.result()
+        except Exception as error:
+            worker.log.warning('Warmup failed: %s', error)
+            break
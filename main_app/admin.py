@@ -2,7 +2,7 @@ from django.contrib import admin
 from django.contrib.auth.models import User
 from django.contrib.auth.admin import UserAdmin
 
-from .models import Lesson, UserDetail
+from .models import Lesson, UserDetail, LessonArchive
 
 
 class LessonAdmin(admin.ModelAdmin):
@@ -12,6 +12,15 @@ class LessonAdmin(admin.ModelAdmin):
     list_per_page = 50
 
 
+class LessonArchiveAdmin(admin.ModelAdmin):
+    list_display = ('id', 'date', 'time', 'student', 'salary', )
+    list_display_links = ('id', )
+    ordering = ('-date', 'time', )
+    list_per_page = 50
+    readonly_fields = ('id', 'student', 'created_at', 'salary', 'time',
+                       'date', 'archived_at')
+
+
 class InlineAdmin(admin.TabularInline):
     list_display = ('phone', 'telegram')
     model = UserDetail
@@ -34,6 +43,7 @@ class CustomUserDetailAdmin(admin.ModelAdmin):
 
 
 admin.site.register(Lesson, LessonAdmin)
+admin.site.register(LessonArchive, LessonArchiveAdmin)
 admin.site.unregister(User)
 admin.site.register(User, CustomUserAdmin)
 admin.site.register(UserDetail, CustomUserDetailAdmin)
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class MainAppConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "main_app"
+
+    def ready(self):
+        from . import signals  # noqa: F401
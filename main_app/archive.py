@@ -0,0 +1,62 @@
+""" Hot/cold split of lessons.
+
+Lessons older than settings.LESSON_ARCHIVE_DAYS are moved to LessonArchive in
+batched transactions, so the hot Lesson table (and its indexes) contains only
+the recent and the future lessons. lesson_history() reads both tables. """
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Lesson, LessonArchive
+from .services import delete_rows
+
+
+ARCHIVE_BATCH_SIZE = 1000
+LESSON_FIELDS = ('id', 'student', 'created_at', 'salary', 'time', 'date')
+
+
+def get_archive_horizon():
+    return timezone.localdate() - timedelta(days=settings.LESSON_ARCHIVE_DAYS)
+
+
+def archive_lessons(before=None, batch_size=ARCHIVE_BATCH_SIZE):
+    """ Moves lessons with date < before to the archive, returns the amount
+    of moved lessons. The summaries aren't changed: they include
+    the archive """
+
+    before = before or get_archive_horizon()
+    archived = 0
+    while True:
+        with transaction.atomic():
+            batch = list(Lesson.objects.filter(
+                date__lt=before
+            ).order_by('pk')[:batch_size])
+            if not batch:
+                break
+            LessonArchive.objects.bulk_create([
+                LessonArchive(
+                    id=lesson.pk,
+                    student_id=lesson.student_id,
+                    created_at=lesson.created_at,
+                    salary=lesson.salary,
+                    time=lesson.time,
+                    date=lesson.date,
+                    high_cost=lesson.high_cost,
+                ) for lesson in batch
+            ])
+            # the lessons are moved, so the delete signals (summaries)
+            # must not be sent
+            delete_rows(Lesson, [lesson.pk for lesson in batch])
+        archived += len(batch)
+    return archived
+
+
+def lesson_history():
+    """ All lessons (hot and archived) as Lesson objects ordered by date """
+
+    return Lesson.objects.only(*LESSON_FIELDS).order_by().union(
+        LessonArchive.objects.only(*LESSON_FIELDS).order_by(), all=True
+    ).order_by('date', 'time')
@@ -0,0 +1,97 @@
+""" Prefix index of active students for the autocomplete of the admin panel.
+
+Every process keeps the index in memory: sorted search keys (alias, first
+name, their words, phone and telegram) with student ids, searched by bisect.
+Changes of users and details bump the students version in the cache
+(see signals.py), so every process rebuilds its index on the next search. """
+
+import threading
+from bisect import bisect_left
+
+from .models import User
+from .services import STUDENTS_VERSION_KEY, get_version
+
+
+AUTOCOMPLETE_LIMIT = 10
+
+_lock = threading.Lock()
+_index = None
+
+
+def get_label(alias, first_name):
+    return f'{alias} ({first_name})' if alias else first_name
+
+
+def get_search_keys(alias, first_name, phone, telegram):
+    keys = set()
+    for text in (alias, first_name):
+        words = (text or '').casefold().split()
+        keys.update(' '.join(words[i:]) for i in range(len(words)))
+    if phone:
+        keys.add(phone)
+    if telegram:
+        keys.update((telegram.casefold(), telegram.casefold().lstrip('@')))
+    return keys
+
+
+class StudentIndex:
+
+    def __init__(self, version, students):
+        """ students: (id, alias, first_name, phone, telegram) """
+
+        self.version = version
+        self.labels = {}
+        entries = []
+        for pk, alias, first_name, phone, telegram in students:
+            self.labels[pk] = get_label(alias, first_name)
+            entries.extend(
+                (key, pk)
+                for key in get_search_keys(alias, first_name, phone, telegram)
+            )
+        entries.sort()
+        self.keys = [key for key, _pk in entries]
+        self.ids = [pk for _key, pk in entries]
+        self.ordered = sorted(self.labels,
+                              key=lambda pk: self.labels[pk].casefold())
+
+    def search(self, prefix, limit=AUTOCOMPLETE_LIMIT):
+        """ [(id, label)] of students with a key starting with the prefix,
+        the first students by label for an empty prefix """
+
+        prefix = ' '.join(prefix.casefold().split())
+        if not prefix:
+            return [(pk, self.labels[pk]) for pk in self.ordered[:limit]]
+        found = {}
+        position = bisect_left(self.keys, prefix)
+        while (len(found) < limit and position < len(self.keys)
+               and self.keys[position].startswith(prefix)):
+            pk = self.ids[position]
+            found.setdefault(pk, self.labels[pk])
+            position += 1
+        return list(found.items())
+
+
+def build_index(version):
+    students = User.objects.filter(
+        is_staff=False, is_active=True
+    ).values_list('pk', 'details__alias', 'first_name', 'details__phone',
+                  'details__telegram')
+    return StudentIndex(version, students)
+
+
+def get_index():
+    """ Index of the current students version, rebuilt once per change """
+
+    global _index
+    version = get_version(STUDENTS_VERSION_KEY)
+    index = _index
+    if index is None or index.version != version:
+        with _lock:
+            index = _index
+            if index is None or index.version != version:
+                index = _index = build_index(version)
+    return index
+
+
+def search_students(prefix, limit=AUTOCOMPLETE_LIMIT):
+    return get_index().search(prefix, limit)
@@ -0,0 +1,22 @@
+""" Authentication backend which loads the user with the details.
+
+AuthenticationMiddleware loads request.user once per request (lazily) by
+get_user() of the backend, so request.user.details doesn't cost an extra
+query. See services.get_user_details() """
+
+from django.contrib.auth.backends import ModelBackend
+
+from .models import User
+
+# path for login(): with several AUTHENTICATION_BACKENDS it is required
+USER_DETAILS_BACKEND = 'main_app.backends.UserDetailsBackend'
+
+
+class UserDetailsBackend(ModelBackend):
+
+    def get_user(self, user_id):
+        try:
+            user = User.objects.select_related('details').get(pk=user_id)
+        except User.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
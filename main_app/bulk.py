@@ -0,0 +1,138 @@
+""" Bulk admin actions on lessons and time blocks.
+
+Every action changes the rows by one UPDATE or DELETE inside a transaction.
+Queryset updates and services.delete_rows() don't send signals, so an action
+rebuilds the summaries of the touched dates and bumps the schedule version
+once.
+Wrong input raises ValueError with a message for the admin. """
+
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import (
+    BooleanField, Case, DateField, IntegerField, Q, Value, When
+)
+from django.utils import timezone
+from django.utils.translation import gettext as _
+
+from .models import Lesson, TimeBlock, User
+from .reports import rebuild_summaries
+from .services import (
+    bump_schedule_version, delete_rows, find_conflict, get_conflict_message,
+    get_high_cost_condition
+)
+from spacepython.constraints import C_salary_common, C_salary_high
+
+
+def cancel_lessons(day):
+    """ Deletes all lessons of the day, returns the amount """
+
+    with transaction.atomic():
+        lessons = Lesson.objects.select_for_update().filter(date=day)
+        cancelled = delete_rows(Lesson, lessons.values_list('pk', flat=True))
+        if cancelled:
+            rebuild_summaries(day, day)
+    if cancelled:
+        bump_schedule_version()
+    return cancelled
+
+
+def delete_blocks(block_ids):
+    """ Deletes the time blocks, returns the amount """
+
+    deleted = delete_rows(TimeBlock, block_ids)
+    if deleted:
+        bump_schedule_version()
+    return deleted
+
+
+def shift_lessons(lesson_ids, days):
+    """ Moves the lessons by the amount of days (can be negative), returns
+    the amount. Lessons can't be moved to the past or on busy time (the new
+    time of every lesson is checked by find_conflict) """
+
+    with transaction.atomic():
+        lessons = list(Lesson.objects.select_for_update().filter(
+            pk__in=lesson_ids
+        ).values_list('pk', 'date', 'time'))
+        if not lessons or not days:
+            return 0
+        delta = timedelta(days=days)
+        ids = [pk for pk, _day, _time in lessons]
+        dates = {day for _pk, day, _time in lessons}
+        if min(dates) + delta < timezone.localdate():
+            raise ValueError(_("Lessons can't be moved to the past"))
+        others = Lesson.objects.exclude(pk__in=ids)
+        for _pk, day, time in lessons:
+            conflict = find_conflict(day + delta, time, lessons=others)
+            if conflict:
+                raise ValueError(_(
+                    "The lesson of {} at {} can't be moved. {}"
+                ).format(day, time, get_conflict_message(conflict)))
+
+        moved = Lesson.objects.filter(pk__in=ids).update(date=Case(
+            *(When(date=day, then=Value(day + delta)) for day in dates),
+            output_field=DateField()
+        ))
+        touched = dates | {day + delta for day in dates}
+        rebuild_summaries(min(touched), max(touched))
+    bump_schedule_version()
+    return moved
+
+
+def reassign_lessons(lesson_ids, student_id):
+    """ Gives the lessons to another student, returns the amount. Salaries
+    and high cost flags of the lessons stay the same, so the summaries too """
+
+    if not User.objects.filter(pk=student_id, is_staff=False).exists():
+        raise ValueError(_("Student doesn't exist"))
+    reassigned = Lesson.objects.filter(pk__in=lesson_ids).update(
+        student_id=student_id
+    )
+    if reassigned:
+        bump_schedule_version()
+    return reassigned
+
+
+def reprice_lessons(student_ids):
+    """ Recalculates salaries of the future lessons of the students by their
+    current costs (see calculate_salary) with their high cost flags, returns
+    the amount of changed lessons """
+
+    costs = {
+        pk: (usual_cost or C_salary_common, high_cost or C_salary_high)
+        for pk, usual_cost, high_cost in User.objects.filter(
+            pk__in=student_ids
+        ).values_list('pk', 'details__usual_cost', 'details__high_cost')
+    }
+    if not costs:
+        return 0
+
+    def by_student(index):
+        return Case(*(When(student_id=pk, then=Value(cost[index]))
+                      for pk, cost in costs.items()))
+
+    condition = get_high_cost_condition()
+    salary = Case(When(condition, then=by_student(1)),
+                  default=by_student(0), output_field=IntegerField())
+    # see reports.is_high_cost
+    raised = [pk for pk, (usual_cost, high_cost) in costs.items()
+              if high_cost > usual_cost]
+    high_cost = Case(When(condition & Q(student_id__in=raised),
+                          then=Value(True)),
+                     default=Value(False), output_field=BooleanField())
+    now = timezone.localtime()
+    lessons = Lesson.objects.filter(
+        Q(date__gt=now.date()) | Q(date=now.date(), time__gt=now.time()),
+        student_id__in=costs
+    )
+    with transaction.atomic():
+        # only the changed rows, so the amount is the real changes
+        repriced = lessons.exclude(salary=salary, high_cost=high_cost).update(
+            salary=salary, high_cost=high_cost
+        )
+        if repriced:
+            rebuild_summaries(now.date())
+    if repriced:
+        bump_schedule_version()
+    return repriced
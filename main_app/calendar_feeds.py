@@ -0,0 +1,142 @@
+""" iCalendar (.ics) feeds of lessons for calendar apps.
+
+Every student has a feed of own lessons, the admin has a feed of all lessons
+and blocks. Feeds are addressed by a signed token, so the feed request doesn't
+touch the database: the body is cached by the schedule version and
+the booking window (the feed starts FEED_HISTORY before it), the ETag is
+built from the same values. """
+
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.core import signing
+from django.core.cache import cache
+from django.utils import timezone
+
+from .models import Lesson, TimeBlock, User
+from .services import get_schedule_version, get_booking_window
+from spacepython.constraints import C_lesson_duration
+
+
+FEED_SALT = 'main_app.calendar_feeds'
+FEED_HISTORY = timedelta(days=30)  # past lessons in the feed
+FEED_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def get_feed_token(user):
+    kind = 'admin' if user.is_staff else 'student'
+    return signing.Signer(salt=FEED_SALT).sign(f'{kind}.{user.pk}')
+
+
+def read_feed_token(token):
+    """ Returns (kind, user_id) or None for a wrong token """
+
+    try:
+        kind, user_id = signing.Signer(salt=FEED_SALT).unsign(
+            token).split('.')
+    except (signing.BadSignature, ValueError):
+        return None
+    return kind, int(user_id)
+
+
+def get_feed_etag(kind, user_id, version=None, window=None):
+    version = version or get_schedule_version()
+    window = window or get_booking_window()
+    return f'"{kind}-{user_id}-{version}-{window.key}"'
+
+
+def get_feed(kind, user_id, version=None, window=None):
+    """ Cached body of the feed for the schedule version and
+    the booking window """
+
+    version = version or get_schedule_version()
+    window = window or get_booking_window()
+    key = f'ics:{kind}:{user_id}:{version}:{window.key}'
+    body = cache.get(key)
+    if body is None:
+        body = build_feed(kind, user_id, window.start - FEED_HISTORY)
+        cache.set(key, body, FEED_CACHE_TIMEOUT)
+    return body
+
+
+def build_feed(kind, user_id, start):
+    lessons = Lesson.objects.filter(date__gte=start)
+    events = []
+    if kind == 'admin':
+        if not User.objects.filter(pk=user_id, is_staff=True).exists():
+            return build_calendar([])
+        lessons = lessons.select_related('student__details')
+        for block in TimeBlock.objects.filter(date__gte=start):
+            events.append((
+                f'block-{block.pk}',
+                _combine(block.date, block.start_time),
+                _combine(block.date, block.end_time),
+                'Blocked time',
+            ))
+    else:
+        lessons = lessons.filter(student_id=user_id)
+
+    for lesson in lessons:
+        start_at = _combine(lesson.date, lesson.time)
+        if kind == 'admin':
+            details = getattr(lesson.student, 'details', None)
+            name = lesson.student.first_name
+            if details and details.alias:
+                name = f'{details.alias} ({name})'
+            summary = f'Lesson: {name}, {lesson.salary} RUB'
+        else:
+            summary = 'Python lesson'
+        events.append((f'lesson-{lesson.pk}', start_at,
+                       start_at + C_lesson_duration, summary))
+    return build_calendar(events)
+
+
+def build_calendar(events):
+    stamp = _format(timezone.now())
+    lines = [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        'PRODID:-//spacepython//calendar//EN',
+        'CALSCALE:GREGORIAN',
+        'X-WR-CALNAME:spacepython',
+    ]
+    for uid, start_at, end_at, summary in events:
+        lines.extend((
+            'BEGIN:VEVENT',
+            f'UID:{uid}@spacepython',
+            f'DTSTAMP:{stamp}',
+            f'DTSTART:{_format(start_at)}',
+            f'DTEND:{_format(end_at)}',
+            f'SUMMARY:{_escape(summary)}',
+            'END:VEVENT',
+        ))
+    lines.append('END:VCALENDAR')
+    return '\r\n'.join(_fold(line) for line in lines) + '\r\n'
+
+
+def _combine(day, time):
+    return timezone.make_aware(datetime.combine(day, time))
+
+
+def _format(moment):
+    return moment.astimezone(dt_timezone.utc).strftime(r'%Y%m%dT%H%M%SZ')
+
+
+def _escape(text):
+    return (text.replace('\\', '\\\\').replace(';', '\\;')
+            .replace(',', '\\,').replace('\n', '\\n'))
+
+
+def _fold(line):
+    """ Lines longer than 75 octets are folded (RFC 5545) """
+
+    encoded = line.encode()
+    if len(encoded) <= 75:
+        return line
+    parts = []
+    while encoded:
+        size = 75 if not parts else 74
+        while size < len(encoded) and (encoded[size] & 0xC0) == 0x80:
+            size -= 1  # don't split utf-8 characters
+        parts.append(encoded[:size].decode())
+        encoded = encoded[size:]
+    return '\r\n '.join(parts)
@@ -0,0 +1,69 @@
+""" Streaming export of the lesson history (CSV and NDJSON).
+
+Rows are produced one by one from QuerySet.iterator(), so the memory usage
+doesn't depend on the amount of exported lessons. The export reads the hot
+Lesson table and LessonArchive by one UNION ALL query. """
+
+import csv
+import json
+
+from .models import Lesson, LessonArchive
+
+
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_HEADER = ('id', 'date', 'time', 'salary', 'student_id', 'first_name',
+                 'alias', 'phone', 'telegram')
+EXPORT_FIELDS = ('id', 'date', 'time', 'salary', 'student_id',
+                 'student__first_name', 'student__details__alias',
+                 'student__details__phone', 'student__details__telegram')
+
+
+class Echo:
+    """ File-like object for csv.writer which returns the written line """
+
+    def write(self, value):
+        return value
+
+
+def get_export_queryset(date_from=None, date_to=None, student_id=None):
+    """ Rows of the hot and archived lessons (see main_app.archive) """
+
+    querysets = []
+    for model in (Lesson, LessonArchive):
+        queryset = model.objects.order_by()
+        if date_from:
+            queryset = queryset.filter(date__gte=date_from)
+        if date_to:
+            queryset = queryset.filter(date__lte=date_to)
+        if student_id:
+            queryset = queryset.filter(student_id=student_id)
+        querysets.append(queryset.values_list(*EXPORT_FIELDS))
+    return querysets[0].union(querysets[1], all=True).order_by(
+        'date', 'time', 'id'
+    )
+
+
+def iter_lesson_rows(queryset):
+    for row in queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        lesson_id, lesson_date, lesson_time, *other = row
+        yield (lesson_id, lesson_date.isoformat(),
+               lesson_time.strftime(r'%H:%M'), *other)
+
+
+def iter_csv(queryset):
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_HEADER)
+    for row in iter_lesson_rows(queryset):
+        yield writer.writerow(row)
+
+
+def iter_ndjson(queryset):
+    for row in iter_lesson_rows(queryset):
+        yield json.dumps(dict(zip(EXPORT_HEADER, row)),
+                         ensure_ascii=False) + '\n'
+
+
+EXPORT_FORMATS = {
+    'csv': (iter_csv, 'text/csv; charset=utf-8'),
+    'ndjson': (iter_ndjson, 'application/x-ndjson; charset=utf-8'),
+}
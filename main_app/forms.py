@@ -6,6 +6,7 @@ from django.contrib.auth.forms import AuthenticationForm
 from django.utils.translation import gettext as _
 
 from .models import Lesson, TimeBlock
+from .services import find_conflict, get_conflict_message
 from spacepython.constraints import (
     С_morning_time, C_evening_time,  C_timedelta,  C_datedelta
 )
@@ -165,30 +166,11 @@ class AddLessonForm(forms.Form):
             messages.error(request, _("The time {} is too late").format(time))
             return False
 
-        # free time check
-        queryset = Lesson.objects.filter(date=date).values_list('time')
-        times = [item[0] for item in queryset]
-        for t1 in times:
-            t2 = datetime.time(t1.hour+1, t1.minute, t1.second)
-            if t1 <= time < t2:
-                messages.error(
-                    request,
-                    _("Some lesson is already scheduled for {} that "
-                      "day").format(t1)
-                )
-                return False
-
-        # check blocked time overlap
-        blocked_times = TimeBlock.objects.filter(date=date).values(
-            'start_time', 'end_time')
-        for blocked_time in blocked_times:
-            if (blocked_time['start_time'] <= time < blocked_time['end_time']
-                    or time == blocked_time['end_time'] == datetime.time(23)):
-                messages.error(
-                    request,
-                    _("This time is blocked")
-                )
-                return False
+        # free time and blocked time check
+        conflict = find_conflict(date, time)
+        if conflict:
+            messages.error(request, get_conflict_message(conflict))
+            return False
 
         # super consist variable because it is used by AddLessonAdminForm class
         return super(forms.Form, self).is_valid()
@@ -200,7 +182,7 @@ class AddLessonAdminForm(forms.Form):
     student = forms.CharField(
         label=_('Student'),
         widget=forms.Select(
-            choices=[],  # is taken from view (get_context_date AddLessonAP)
+            choices=[],  # is loaded by the page from StudentAutocompleteAPI
             attrs={
                 'class': 'form-control',
                 'size': 10
@@ -237,11 +219,6 @@ class AddLessonAdminForm(forms.Form):
             )
             return False
 
-        date = datetime.datetime.strptime(
-            form['date'].value(),
-            r"%Y-%m-%d"
-        ).date()
-
         if form['student'].value() == '':
             messages.error(
                 request,
@@ -249,18 +226,6 @@ class AddLessonAdminForm(forms.Form):
             )
             return False
 
-        # check blocked time overlap
-        blocked_times = TimeBlock.objects.filter(date=date).values(
-            'start_time', 'end_time')
-        for blocked_time in blocked_times:
-            if (blocked_time['start_time'] <= time < blocked_time['end_time']
-                    or time == blocked_time['end_time'] == datetime.time(23)):
-                messages.error(
-                    request,
-                    _("This time is blocked")
-                )
-                return False
-
         # uses created validator from AddLessonForm class
         return AddLessonForm.is_valid(self, request, form)
 
@@ -443,3 +408,30 @@ class StudentUpdateForm(forms.Form):
         label=_('Student is active?'),
         required=False
     )
+    reprice_lessons = forms.BooleanField(
+        label=_('Reprice future lessons'),
+        required=False
+    )
+
+
+class ImportAPForm(forms.Form):
+    """ Form for the bulk csv import in the admin panel """
+
+    kind = forms.ChoiceField(
+        label=_('What to import'),
+        choices=(('students', _('Students')), ('lessons', _('Lessons'))),
+        widget=forms.Select(attrs={
+            'class': 'form-control',
+        })
+    )
+    file = forms.FileField(
+        label=_('CSV file'),
+        widget=forms.ClearableFileInput(attrs={
+            'class': 'form-control',
+            'accept': '.csv',
+        })
+    )
+    dry_run = forms.BooleanField(
+        label=_('Only check the file'),
+        required=False
+    )
@@ -0,0 +1,274 @@
+""" Bulk import of students and lessons from CSV files.
+
+The whole file is validated at once: uniqueness of contacts is checked by one
+set-based query and lesson conflicts by one range query per table. Valid rows
+are inserted by bulk_create() in chunked transactions, invalid rows are
+returned in the report with the line number and the reason. """
+
+import csv
+import datetime
+import io
+import uuid
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils.translation import gettext as _
+
+from rest_framework.authtoken.models import Token
+
+from .models import Lesson, TimeBlock, User, UserDetail
+from .reports import is_high_cost, rebuild_summaries
+from .services import (
+    calculate_salary, bump_schedule_version, bump_version,
+    STUDENTS_VERSION_KEY
+)
+
+
+IMPORT_CHUNK_SIZE = 500
+
+
+class ImportReport:
+    """ Result of the import: amount of created rows and errors by line """
+
+    def __init__(self):
+        self.created = 0
+        self._errors = []
+
+    @property
+    def errors(self):
+        return sorted(self._errors)
+
+    def add_error(self, line, message):
+        self._errors.append((line, message))
+
+    def __bool__(self):
+        return not self._errors
+
+
+def read_csv(file):
+    """ Rows of the uploaded (bytes) or opened (text) csv file with their
+    line numbers """
+
+    if isinstance(file, (bytes, bytearray)):
+        file = io.StringIO(file.decode('utf-8-sig'))
+    reader = csv.DictReader(file)
+    for row in reader:
+        yield reader.line_num, {
+            key.strip(): (value or '').strip()
+            for key, value in row.items() if key
+        }
+
+
+def chunks(items, size=IMPORT_CHUNK_SIZE):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _to_cost(value):
+    return int(value) if value else None
+
+
+def check_contacts(phone, telegram):
+    """ The same rules as in RegistrationValidator """
+
+    if not phone and not telegram:
+        return _('You must provide a phone number or telegram nickname')
+    if phone and not phone.isdigit():
+        return _("Phone number must be digits only")
+    if phone and len(phone) != 11:
+        return _("Phone number must contain 11 digits")
+    if telegram and telegram[0] != '@':
+        return _("Telegram nickname must start with '@..'")
+    if telegram and len(telegram.split()) > 1:
+        return _("Telegram nickname doen't contain spaces")
+    return None
+
+
+def import_students(rows, dry_run=False):
+    """ Columns: first_name, phone, telegram, alias, usual_cost, high_cost """
+
+    report = ImportReport()
+    rows = list(rows)
+
+    phones = {row.get('phone') for _line, row in rows if row.get('phone')}
+    telegrams = {row.get('telegram') for _line, row in rows
+                 if row.get('telegram')}
+    existing = list(UserDetail.objects.filter(
+        Q(phone__in=phones) | Q(telegram__in=telegrams)
+    ).values_list('phone', 'telegram'))
+    used_phones = {phone for phone, _telegram in existing if phone}
+    used_telegrams = {telegram for _phone, telegram in existing if telegram}
+
+    students = []
+    for line, row in rows:
+        phone = row.get('phone') or None
+        telegram = row.get('telegram') or None
+        error = check_contacts(phone, telegram)
+        if not error and not row.get('first_name'):
+            error = _("Name is required")
+        if not error and phone in used_phones:
+            error = _("This phone already exists")
+        if not error and telegram in used_telegrams:
+            error = _("This telegram nickname already exists")
+        if not error:
+            try:
+                costs = (_to_cost(row.get('usual_cost')),
+                         _to_cost(row.get('high_cost')))
+            except ValueError:
+                error = _("Cost must be a number")
+        if error:
+            report.add_error(line, error)
+            continue
+
+        if phone:
+            used_phones.add(phone)
+        if telegram:
+            used_telegrams.add(telegram)
+        user = User(first_name=row['first_name'],
+                    username=f'import_{uuid.uuid4().hex}')
+        user.set_unusable_password()
+        detail = UserDetail(phone=phone, telegram=telegram,
+                            alias=row.get('alias') or None)
+        if costs[0]:
+            detail.usual_cost = costs[0]
+        if costs[1]:
+            detail.high_cost = costs[1]
+        students.append((user, detail))
+
+    if dry_run:
+        report.created = len(students)
+        return report
+
+    for chunk in chunks(students):
+        with transaction.atomic():
+            users = User.objects.bulk_create(
+                [user for user, _detail in chunk]
+            )
+            details = []
+            for user, (_user, detail) in zip(users, chunk):
+                detail.user = user
+                details.append(detail)
+            UserDetail.objects.bulk_create(details)
+            Token.objects.bulk_create([
+                Token(user=user, key=Token.generate_key()) for user in users
+            ])
+        report.created += len(chunk)
+    # bulk_create doesn't send signals
+    bump_version(STUDENTS_VERSION_KEY)
+    return report
+
+
+def _parse_lesson(row):
+    try:
+        date = datetime.date.fromisoformat(row.get('date', ''))
+    except ValueError:
+        raise ValueError(_("Date must be YYYY-MM-DD"))
+    try:
+        time = datetime.datetime.strptime(
+            row.get('time', '').split(':')[0], r'%H'
+        ).time()
+    except ValueError:
+        raise ValueError(_("Time must be in 'hours' or 'hours:minutes' "
+                           "format"))
+    try:
+        salary = int(row['salary']) if row.get('salary') else None
+    except ValueError:
+        raise ValueError(_("Salary must be a number"))
+    return date, time, salary
+
+
+def import_lessons(rows, dry_run=False):
+    """ Columns: date, time, salary (optional) and the student given by
+    student_id, phone or telegram """
+
+    report = ImportReport()
+    parsed = []
+    for line, row in rows:
+        try:
+            parsed.append((line, row, *_parse_lesson(row)))
+        except ValueError as error:
+            report.add_error(line, str(error))
+    if not parsed:
+        return report
+
+    # students by id, phone and telegram with their costs
+    ids = {row['student_id'] for _line, row, *_rest in parsed
+           if row.get('student_id', '').isdigit()}
+    phones = {row['phone'] for _line, row, *_rest in parsed
+              if row.get('phone')}
+    telegrams = {row['telegram'] for _line, row, *_rest in parsed
+                 if row.get('telegram')}
+    students = {}
+    for pk, phone, telegram, usual_cost, high_cost in User.objects.filter(
+        Q(pk__in=ids) | Q(details__phone__in=phones) |
+        Q(details__telegram__in=telegrams)
+    ).values_list('pk', 'details__phone', 'details__telegram',
+                  'details__usual_cost', 'details__high_cost'):
+        student = (pk, usual_cost, high_cost)
+        students[('student_id', str(pk))] = student
+        students[('phone', phone)] = student
+        students[('telegram', telegram)] = student
+
+    # occupied times in the range of the file
+    dates = [item[2] for item in parsed]
+    date_range = (min(dates), max(dates))
+    lessons = defaultdict(list)
+    for date, time in Lesson.objects.filter(
+        date__range=date_range
+    ).values_list('date', 'time'):
+        lessons[date].append(time)
+    blocks = defaultdict(list)
+    for date, start_time, end_time in TimeBlock.objects.filter(
+        date__range=date_range
+    ).values_list('date', 'start_time', 'end_time'):
+        blocks[date].append((start_time, end_time))
+
+    new_lessons = []
+    for line, row, date, time, salary in parsed:
+        student = None
+        for key in ('student_id', 'phone', 'telegram'):
+            if row.get(key):
+                student = students.get((key, row[key]))
+                break
+        if student is None:
+            report.add_error(line, _("Student doesn't exist"))
+            continue
+        error = _find_conflict(time, lessons[date], blocks[date])
+        if error:
+            report.add_error(line, error)
+            continue
+
+        if salary is None:
+            salary = calculate_salary(time, len(lessons[date]),
+                                      student[1], student[2])
+        lessons[date].append(time)
+        new_lessons.append(Lesson(
+            student_id=student[0], date=date, time=time, salary=salary,
+            high_cost=is_high_cost(salary, student[1])
+        ))
+
+    report.created = len(new_lessons)
+    if dry_run or not new_lessons:
+        return report
+
+    for chunk in chunks(new_lessons):
+        with transaction.atomic():
+            Lesson.objects.bulk_create(chunk)
+    # bulk_create doesn't send signals
+    rebuild_summaries(*date_range)
+    bump_schedule_version()
+    return report
+
+
+def _find_conflict(time, lesson_times, blocks):
+    for t1 in lesson_times:
+        if t1 <= time and (t1.hour == 23 or time < datetime.time(
+                t1.hour + 1, t1.minute, t1.second)):
+            return _("Some lesson is already scheduled for {} that "
+                     "day").format(t1)
+    for start_time, end_time in blocks:
+        if (start_time <= time < end_time
+                or time == end_time == datetime.time(23)):
+            return _("This time is blocked")
+    return None
@@ -0,0 +1,29 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from main_app.archive import (
+    ARCHIVE_BATCH_SIZE, archive_lessons, get_archive_horizon
+)
+
+
+class Command(BaseCommand):
+    help = 'Moves old lessons from Lesson to LessonArchive'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int,
+                            help='archive lessons older than that, '
+                                 'default: settings.LESSON_ARCHIVE_DAYS')
+        parser.add_argument('--batch-size', type=int,
+                            default=ARCHIVE_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        if options['days'] is not None:
+            before = timezone.localdate() - timedelta(days=options['days'])
+        else:
+            before = get_archive_horizon()
+        archived = archive_lessons(before, options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'{archived} lessons older than {before} are archived'
+        ))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from main_app.imports import import_lessons, read_csv
+
+
+class Command(BaseCommand):
+    help = 'Bulk import of lessons from a csv file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='path to the csv file')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='validate the file without saving')
+
+    def handle(self, *args, **options):
+        with open(options['path'], encoding='utf-8-sig', newline='') as file:
+            report = import_lessons(read_csv(file), options['dry_run'])
+
+        for line, message in report.errors:
+            self.stderr.write(f'line {line}: {message}')
+        verb = 'valid' if options['dry_run'] else 'created'
+        self.stdout.write(self.style.SUCCESS(
+            f'{report.created} lessons {verb}, {len(report.errors)} errors'
+        ))
@@ -0,0 +1,19 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from main_app.reports import rebuild_summaries
+
+
+class Command(BaseCommand):
+    help = 'Recalculates daily and monthly revenue summaries from lessons'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', type=date.fromisoformat,
+                            help='first date (YYYY-MM-DD), default: all')
+        parser.add_argument('--end', type=date.fromisoformat,
+                            help='last date (YYYY-MM-DD), default: all')
+
+    def handle(self, *args, **options):
+        rebuild_summaries(options['start'], options['end'])
+        self.stdout.write(self.style.SUCCESS('Summaries are rebuilt'))
@@ -0,0 +1,84 @@
+# Generated by Django 4.1.2 on 2026-10-19 09:06
+
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def fill_summaries(apps, schema_editor):
+    """ Summaries of the lessons created before the reports existed """
+
+    Lesson = apps.get_model('main_app', 'Lesson')
+    DailySummary = apps.get_model('main_app', 'DailySummary')
+    MonthlySummary = apps.get_model('main_app', 'MonthlySummary')
+
+    usual_cost = Coalesce('student__details__usual_cost', Value(1000))
+    rows = Lesson.objects.order_by().values('date').annotate(
+        lessons_amount=Count('id'),
+        revenue_amount=Sum('salary'),
+        high_cost_amount=Count('id', filter=Q(salary__gt=usual_cost)),
+    )
+    months = {}
+    for row in rows:
+        DailySummary.objects.create(
+            date=row['date'],
+            lessons=row['lessons_amount'],
+            revenue=row['revenue_amount'],
+            occupied_hours=row['lessons_amount'],
+            high_cost_lessons=row['high_cost_amount'],
+        )
+        month = months.setdefault(row['date'].replace(day=1), [0, 0, 0])
+        month[0] += row['lessons_amount']
+        month[1] += row['revenue_amount']
+        month[2] += row['high_cost_amount']
+    for month, (lessons, revenue, high_cost) in months.items():
+        MonthlySummary.objects.create(
+            month=month,
+            lessons=lessons,
+            revenue=revenue,
+            occupied_hours=lessons,
+            high_cost_lessons=high_cost,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0002_userdetail_notice'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailySummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True)),
+                ('lessons', models.IntegerField(default=0)),
+                ('revenue', models.IntegerField(default=0)),
+                ('occupied_hours', models.IntegerField(default=0)),
+                ('high_cost_lessons', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Daily summary',
+                'verbose_name_plural': 'Daily summaries',
+                'ordering': ('date',),
+            },
+        ),
+        migrations.CreateModel(
+            name='MonthlySummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(unique=True)),
+                ('lessons', models.IntegerField(default=0)),
+                ('revenue', models.IntegerField(default=0)),
+                ('occupied_hours', models.IntegerField(default=0)),
+                ('high_cost_lessons', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Monthly summary',
+                'verbose_name_plural': 'Monthly summaries',
+                'ordering': ('month',),
+            },
+        ),
+        migrations.RunPython(fill_summaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.1.2 on 2026-10-19 09:10
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('main_app', '0003_summaries'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LessonArchive',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField()),
+                ('salary', models.IntegerField()),
+                ('time', models.TimeField()),
+                ('date', models.DateField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_lessons', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Archived lesson',
+                'verbose_name_plural': 'Archived lessons',
+                'ordering': ('date', 'time'),
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+from django.db import migrations
+
+
+def create_date_index(apps, schema_editor):
+    """ The archive is filled in date order: PostgreSQL gets a tiny BRIN
+    index, other backends a usual b-tree """
+
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(
+            'CREATE INDEX main_app_lessonarchive_date_brin '
+            'ON main_app_lessonarchive USING brin (date)'
+        )
+    else:
+        schema_editor.execute(
+            'CREATE INDEX main_app_lessonarchive_date_idx '
+            'ON main_app_lessonarchive (date)'
+        )
+
+
+def drop_date_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX main_app_lessonarchive_date_brin')
+    else:
+        schema_editor.execute('DROP INDEX main_app_lessonarchive_date_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0004_lessonarchive'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_date_index, drop_date_index),
+    ]
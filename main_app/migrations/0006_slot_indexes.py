@@ -0,0 +1,21 @@
+# Generated by Django 4.1.2 on 2026-10-19 09:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0005_lessonarchive_date_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='lesson',
+            index=models.Index(fields=['date', 'time'], name='lesson_date_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='timeblock',
+            index=models.Index(fields=['date', 'start_time'], name='timeblock_date_time_idx'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+from django.db import migrations
+
+
+# (index, table, column) searched by StudentsAP with icontains
+SEARCH_INDEXES = (
+    ('auth_user_first_name_trgm', 'auth_user', 'first_name'),
+    ('main_app_userdetail_alias_trgm', 'main_app_userdetail', 'alias'),
+    ('main_app_userdetail_phone_trgm', 'main_app_userdetail', 'phone'),
+    ('main_app_userdetail_telegram_trgm', 'main_app_userdetail', 'telegram'),
+)
+
+
+def create_search_indexes(apps, schema_editor):
+    """ PostgreSQL gets trigram indexes matching UPPER(column::text) LIKE of
+    icontains. Other backends scan the table, the lists are short there """
+
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, table, column in SEARCH_INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX {name} ON {table} '
+            f'USING gin (UPPER({column}::text) gin_trgm_ops)'
+        )
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, _table, _column in SEARCH_INDEXES:
+        schema_editor.execute(f'DROP INDEX {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('main_app', '0006_slot_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
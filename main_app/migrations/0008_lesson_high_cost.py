@@ -0,0 +1,36 @@
+# Generated by Django 4.1.2 on 2026-10-19 09:54
+
+from django.db import migrations, models
+from django.db.models import Value
+from django.db.models.functions import Coalesce
+
+
+def fill_high_cost(apps, schema_editor):
+    """ The same rule as the summaries were filled by (see 0003), so the
+    existing summaries stay consistent with the flags """
+
+    usual_cost = Coalesce('student__details__usual_cost', Value(1000))
+    for name in ('Lesson', 'LessonArchive'):
+        model = apps.get_model('main_app', name)
+        model.objects.filter(salary__gt=usual_cost).update(high_cost=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0007_student_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lesson',
+            name='high_cost',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='lessonarchive',
+            name='high_cost',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(fill_high_cost, migrations.RunPython.noop),
+    ]
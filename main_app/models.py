@@ -15,11 +15,18 @@ class Lesson(models.Model):
     salary = models.IntegerField()
     time = models.TimeField()
     date = models.DateField()
+    # paid above the usual cost of the student when the salary was set
+    # (see reports.is_high_cost), kept for the summaries
+    high_cost = models.BooleanField(default=False)
 
     class Meta:
         verbose_name = _('Lesson')
         verbose_name_plural = _('Lessons')
         ordering = ('date', 'time')
+        indexes = [
+            models.Index(fields=['date', 'time'],
+                         name='lesson_date_time_idx'),
+        ]
 
     def __str__(self):
         return _('The Lesson class: id = {}').format(self.pk)
@@ -52,6 +59,10 @@ class UserDetail(models.Model):
     def get_absolute_url(self):
         return reverse('student_detail_AP_url', kwargs={'pk': self.user.pk})
 
+    @property
+    def telegram_link(self):
+        return f'https://t.me/{self.telegram[1:]}' if self.telegram else ''
+
 
 class TimeBlock(models.Model):
     """ Time blocking model in admin panel (AP) """
@@ -64,3 +75,75 @@ class TimeBlock(models.Model):
         verbose_name = _('TimeBlock')
         verbose_name_plural = _('Timeblocks')
         ordering = ('date', 'start_time')
+        indexes = [
+            models.Index(fields=['date', 'start_time'],
+                         name='timeblock_date_time_idx'),
+        ]
+
+
+class DailySummary(models.Model):
+    """ Lessons, revenue and occupancy of one day (see main_app.reports) """
+
+    date = models.DateField(unique=True)
+    lessons = models.IntegerField(default=0)
+    revenue = models.IntegerField(default=0)
+    occupied_hours = models.IntegerField(default=0)
+    high_cost_lessons = models.IntegerField(default=0)
+
+    class Meta:
+        verbose_name = _('Daily summary')
+        verbose_name_plural = _('Daily summaries')
+        ordering = ('date', )
+
+    def __str__(self):
+        return _('The DailySummary class: date = {}').format(self.date)
+
+    @property
+    def high_cost_share(self):
+        return self.high_cost_lessons / self.lessons if self.lessons else 0
+
+
+class MonthlySummary(models.Model):
+    """ Lessons, revenue and occupancy of one month (see main_app.reports).
+    month is the first day of the month """
+
+    month = models.DateField(unique=True)
+    lessons = models.IntegerField(default=0)
+    revenue = models.IntegerField(default=0)
+    occupied_hours = models.IntegerField(default=0)
+    high_cost_lessons = models.IntegerField(default=0)
+
+    class Meta:
+        verbose_name = _('Monthly summary')
+        verbose_name_plural = _('Monthly summaries')
+        ordering = ('month', )
+
+    def __str__(self):
+        return _('The MonthlySummary class: month = {}').format(self.month)
+
+    @property
+    def high_cost_share(self):
+        return self.high_cost_lessons / self.lessons if self.lessons else 0
+
+
+class LessonArchive(models.Model):
+    """ Past lessons moved out of Lesson (see main_app.archive). The fields
+    repeat Lesson in the same order, so both tables can be read by UNION """
+
+    id = models.BigIntegerField(primary_key=True)  # id of the former lesson
+    student = models.ForeignKey(User, on_delete=models.CASCADE,
+                                related_name='archived_lessons')
+    created_at = models.DateTimeField()
+    salary = models.IntegerField()
+    time = models.TimeField()
+    date = models.DateField()
+    high_cost = models.BooleanField(default=False)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = _('Archived lesson')
+        verbose_name_plural = _('Archived lessons')
+        ordering = ('date', 'time')
+
+    def __str__(self):
+        return _('The LessonArchive class: id = {}').format(self.pk)
@@ -0,0 +1,163 @@
+""" Revenue and occupancy summaries.
+
+DailySummary and MonthlySummary are kept up to date incrementally by the
+Lesson signals (see signals.py), so the reports never scan the Lesson table.
+Archived lessons (see archive.py) stay in the summaries until their student
+is deleted. A lesson is counted as high cost by its stored flag
+(Lesson.high_cost), so the summaries don't depend on the current costs of the
+students.
+rebuild_summaries() recalculates them from scratch (manage.py
+rebuild_summaries) and must be called after bulk queryset operations, which
+don't send signals. """
+
+from datetime import date
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q, Sum
+
+from .models import (
+    DailySummary, Lesson, LessonArchive, MonthlySummary, User
+)
+from spacepython.constraints import C_lesson_duration, C_salary_common
+
+
+LESSON_HOURS = int(C_lesson_duration.total_seconds() // 3600)
+
+
+def is_high_cost(salary, usual_cost):
+    """ The lesson is paid above the usual cost of the student """
+
+    return salary > (usual_cost or C_salary_common)
+
+
+def get_usual_cost(student_id):
+    usual_cost = User.objects.filter(pk=student_id).values_list(
+        'details__usual_cost', flat=True
+    ).first()
+    return usual_cost or C_salary_common
+
+
+def apply_lesson(lesson_date, salary, high_cost, sign=1):
+    """ Adds (sign=1) or subtracts (sign=-1) one lesson to the summaries """
+
+    changes = {
+        'lessons': sign,
+        'revenue': sign * salary,
+        'occupied_hours': sign * LESSON_HOURS,
+        'high_cost_lessons': sign * int(high_cost),
+    }
+    keys = (
+        (DailySummary, {'date': lesson_date}),
+        (MonthlySummary, {'month': lesson_date.replace(day=1)}),
+    )
+    for model, key in keys:
+        with transaction.atomic():
+            _increment(model, key, changes)
+
+
+def remove_archived_lessons(student_id):
+    """ Subtracts the archived lessons of the student from the summaries.
+    LessonArchive doesn't send signals, so it is called before the student
+    (and the archive by cascade) is deleted """
+
+    rows = LessonArchive.objects.filter(student_id=student_id).order_by(
+    ).values('date').annotate(
+        lessons_amount=Count('id'),
+        revenue_amount=Sum('salary'),
+        high_cost_amount=Count('id', filter=Q(high_cost=True)),
+    )
+    months = {}
+    with transaction.atomic():
+        for row in rows:
+            changes = {
+                'lessons': -row['lessons_amount'],
+                'revenue': -row['revenue_amount'],
+                'occupied_hours': -row['lessons_amount'] * LESSON_HOURS,
+                'high_cost_lessons': -row['high_cost_amount'],
+            }
+            _increment(DailySummary, {'date': row['date']}, changes)
+            month = months.setdefault(row['date'].replace(day=1), {})
+            for field, value in changes.items():
+                month[field] = month.get(field, 0) + value
+        for month, changes in months.items():
+            _increment(MonthlySummary, {'month': month}, changes)
+
+
+def _increment(model, key, changes):
+    expressions = {field: F(field) + value for field, value in changes.items()}
+    if model.objects.filter(**key).update(**expressions):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(**key, **changes)
+    except IntegrityError:
+        # the row was created by a concurrent request
+        model.objects.filter(**key).update(**expressions)
+
+
+def rebuild_summaries(start=None, end=None):
+    """ Recalculates the summaries for lessons between start and end
+    (both included, None means unbounded). Months touched by the range are
+    recalculated entirely from the daily summaries """
+
+    days = DailySummary.objects.all()
+    if start:
+        days = days.filter(date__gte=start)
+    if end:
+        days = days.filter(date__lte=end)
+
+    totals = {}
+    for model in (Lesson, LessonArchive):
+        lessons = model.objects.order_by()
+        if start:
+            lessons = lessons.filter(date__gte=start)
+        if end:
+            lessons = lessons.filter(date__lte=end)
+        rows = lessons.values('date').annotate(
+            lessons_amount=Count('id'),
+            revenue_amount=Sum('salary'),
+            high_cost_amount=Count('id', filter=Q(high_cost=True)),
+        )
+        for row in rows:
+            day = totals.setdefault(row['date'],
+                                    DailySummary(date=row['date']))
+            day.lessons += row['lessons_amount']
+            day.revenue += row['revenue_amount']
+            day.occupied_hours += row['lessons_amount'] * LESSON_HOURS
+            day.high_cost_lessons += row['high_cost_amount']
+
+    with transaction.atomic():
+        days.delete()
+        DailySummary.objects.bulk_create(totals.values(), batch_size=500)
+        _rebuild_months(start, end)
+
+
+def _rebuild_months(start, end):
+    months = MonthlySummary.objects.all()
+    days = DailySummary.objects.all()
+    if start:
+        start = start.replace(day=1)
+        months = months.filter(month__gte=start)
+        days = days.filter(date__gte=start)
+    if end:
+        end = _next_month(end)
+        months = months.filter(month__lt=end)
+        days = days.filter(date__lt=end)
+
+    totals = {}
+    for day in days.order_by('date'):
+        month = day.date.replace(day=1)
+        summary = totals.setdefault(month, MonthlySummary(month=month))
+        summary.lessons += day.lessons
+        summary.revenue += day.revenue
+        summary.occupied_hours += day.occupied_hours
+        summary.high_cost_lessons += day.high_cost_lessons
+
+    months.delete()
+    MonthlySummary.objects.bulk_create(totals.values(), batch_size=500)
+
+
+def _next_month(day):
+    if day.month == 12:
+        return date(day.year + 1, 1, 1)
+    return date(day.year, day.month + 1, 1)
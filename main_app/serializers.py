@@ -1,9 +1,18 @@
 from rest_framework import serializers
+from rest_framework.exceptions import AuthenticationFailed
 from rest_framework.relations import PrimaryKeyRelatedField
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
 
 from django.contrib.auth.models import User
+from django.utils.translation import gettext as _
 
-from .models import Lesson, UserDetail, TimeBlock
+from .models import (
+    Lesson, UserDetail, TimeBlock, DailySummary, MonthlySummary,
+    LessonArchive
+)
+from .bulk import reprice_lessons
 from .validators import (
     AdminValidator, UserValidator, RegistrationValidator, TimeBlockValidator
 )
@@ -35,6 +44,29 @@ class ReceivingTokenSerializer(serializers.Serializer):
     token = serializers.CharField()
 
 
+class ReceivingJWTSerializer(serializers.Serializer):
+    """ Getting access and refresh JWT """
+
+    access = serializers.CharField()
+    refresh = serializers.CharField()
+
+
+class RefreshJWTSerializer(TokenRefreshSerializer):
+    """ Refreshing the access JWT. The user is read again: inactive users
+    get no tokens and is_staff is taken from the database """
+
+    def validate(self, attrs):
+        refresh = RefreshToken(attrs['refresh'])
+        user = User.objects.filter(
+            pk=refresh[api_settings.USER_ID_CLAIM], is_active=True
+        ).only('is_staff').first()
+        if user is None:
+            raise AuthenticationFailed(_('User is inactive'),
+                                       code='user_inactive')
+        refresh['is_staff'] = user.is_staff
+        return {'access': str(refresh.access_token)}
+
+
 class DelUserSerializer(serializers.ModelSerializer):
     """ Deletion user (admin only) """
 
@@ -122,8 +154,13 @@ class StudentAdminSerializer(serializers.Serializer):
     skype = serializers.CharField(source='details.skype')
     last_login = serializers.DateTimeField(read_only=True)
     is_active = serializers.BooleanField()
+    reprice_lessons = serializers.BooleanField(write_only=True, default=False)
+    # amount of changed lessons of the update with reprice_lessons
+    repriced_lessons = serializers.IntegerField(read_only=True,
+                                                allow_null=True)
 
     def update(self, instance, validated_data):
+        reprice = validated_data.pop('reprice_lessons', False)
         for attr, value in validated_data.items():
             if isinstance(value, dict):
                 # instead instance.details (foreign key)
@@ -134,6 +171,8 @@ class StudentAdminSerializer(serializers.Serializer):
             else:
                 setattr(instance, attr, value)
         instance.save()
+        if reprice:
+            instance.repriced_lessons = reprice_lessons([instance.pk])
         return instance
 
 
@@ -144,4 +183,63 @@ class NotificationSerializer(serializers.Serializer):
     amount_lesson = serializers.SerializerMethodField()
 
     def get_amount_lesson(self, obj):
-        return Lesson.objects.filter(student=obj.pk).count()
+        return (Lesson.objects.filter(student=obj.pk).count()
+                + LessonArchive.objects.filter(student=obj.pk).count())
+
+
+class DailySummarySerializer(serializers.ModelSerializer):
+    """ Daily revenue and occupancy report (admin only) """
+
+    high_cost_share = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = DailySummary
+        fields = ('date', 'lessons', 'revenue', 'occupied_hours',
+                  'high_cost_lessons', 'high_cost_share')
+
+
+class MonthlySummarySerializer(serializers.ModelSerializer):
+    """ Monthly revenue and occupancy report (admin only) """
+
+    high_cost_share = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = MonthlySummary
+        fields = ('month', 'lessons', 'revenue', 'occupied_hours',
+                  'high_cost_lessons', 'high_cost_share')
+
+
+class LessonsCancelSerializer(serializers.Serializer):
+    """ Cancel of all lessons of the day (admin only) """
+
+    date = serializers.DateField()
+
+
+class LessonsShiftSerializer(serializers.Serializer):
+    """ Move of lessons by days (admin only) """
+
+    lessons = serializers.ListField(child=serializers.IntegerField(),
+                                    allow_empty=False)
+    days = serializers.IntegerField()
+
+
+class LessonsReassignSerializer(serializers.Serializer):
+    """ Reassign of lessons to another student (admin only) """
+
+    lessons = serializers.ListField(child=serializers.IntegerField(),
+                                    allow_empty=False)
+    student = serializers.IntegerField()
+
+
+class TimeBlocksDeleteSerializer(serializers.Serializer):
+    """ Delete of time blocks (admin only) """
+
+    blocks = serializers.ListField(child=serializers.IntegerField(),
+                                   allow_empty=False)
+
+
+class LessonsRepriceSerializer(serializers.Serializer):
+    """ Reprice of future lessons of students (admin only) """
+
+    students = serializers.ListField(child=serializers.IntegerField(),
+                                     allow_empty=False)
@@ -1,14 +1,50 @@
-from datetime import date, timedelta, datetime
+from datetime import date, timedelta, datetime, time
+from functools import wraps
+import time as time_module
+from typing import NamedTuple
 
-from django.utils.translation import gettext as _
+from django.core.cache import cache
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import connections, router
+from django.db.models import (
+    CharField, Count, F, OuterRef, Q, Subquery, Value
+)
+from django.db.models.functions import Coalesce
+from django.db.models.lookups import GreaterThanOrEqual
+from django.utils import timezone
+from django.utils.translation import gettext as _, get_language
 
 from spacepython.constraints import (
     С_morning_time, С_morning_time_markup, C_evening_time_markup,
     C_evening_time, C_salary_common, C_salary_high, C_lesson_threshold,
-    C_timedelta, C_datedelta
+    C_timedelta, C_datedelta, C_lesson_duration
 )
+from .models import Lesson, TimeBlock, UserDetail
+
+
+def memoize_daily(function):
+    """ Memoizes results of the function by its arguments and the active
+    language. All values expire at local midnight (TIME_ZONE), the results
+    are returned as new lists, so callers may change them """
+
+    memo = {'date': None, 'values': {}}
 
+    @wraps(function)
+    def wrapper(*args):
+        today = timezone.localdate()
+        if memo['date'] != today:
+            memo.update(date=today, values={})
+        values = memo['values']
+        key = (get_language(), args)
+        if key not in values:
+            values[key] = tuple(function(*args))
+        return list(values[key])
 
+    wrapper.cache_clear = lambda: memo.update(date=None, values={})
+    return wrapper
+
+
+@memoize_daily
 def get_weekdays():
     date_choices = []
     weekdays = {
@@ -20,16 +56,260 @@ def get_weekdays():
         'Saturday': _('Saturday'),
         'Sunday': _('Sunday'),
     }
+    today = timezone.localdate()
     for i in range(C_datedelta.days+1):
         if i == 0:
-            day = date.today() + timedelta(days=i)
+            day = today + timedelta(days=i)
             day_title = (f"{_('Today')}, "
                          f"{datetime.strftime(day, r'%d-%m')}")
             date_choices.append((day, day_title))
             continue
-        day = date.today() + timedelta(days=i)
+        day = today + timedelta(days=i)
         day_title = (f"{weekdays[day.strftime('%A')]}, "
                      f"{datetime.strftime(day, r'%d-%m')}")
         date_choices.append((day, day_title))
 
     return date_choices
+
+
+@memoize_daily
+def get_cost_messages(usual_cost, high_cost):
+    """ Explanation of lesson costs for the forms of a new lesson """
+
+    return [
+        _("The cost of a usual lesson is {} ₽").format(usual_cost),
+        _("The cost of a lesson in the early morning to {} is {} ₽.").format(
+            С_morning_time_markup.strftime(r'%H:%M'), high_cost
+        ),
+        _("The cost of a lesson in the late evening to {} is {} ₽.").format(
+            C_evening_time_markup.strftime(r'%H:%M'), high_cost
+        ),
+        _("The cost of a lesson when day is full ({} lessons per day) "
+          "is {} ₽.").format(C_lesson_threshold - 1, high_cost),
+    ]
+
+
+class BookingWindow(NamedTuple):
+    """ Dates of the schedule: from today to today + C_datedelta """
+
+    start: date
+    end: date
+
+    @property
+    def days(self):
+        return [self.start + timedelta(days=i)
+                for i in range((self.end - self.start).days + 1)]
+
+    @property
+    def key(self):
+        """ Part of cache keys, changes at local midnight """
+
+        return f'{self.start:%Y%m%d}-{self.end:%Y%m%d}'
+
+
+def get_booking_window(request=None):
+    """ Booking window by the local date (TIME_ZONE). It is computed once per
+    request, so all querysets of the request use the same dates even around
+    midnight """
+
+    request = getattr(request, '_request', request)  # DRF request
+    window = getattr(request, '_booking_window', None)
+    if window is None:
+        today = timezone.localdate()
+        window = BookingWindow(today, today + C_datedelta)
+        if request is not None:
+            request._booking_window = window
+    return window
+
+
+class ScheduleRow(NamedTuple):
+    """ Card of the schedule on the main page """
+
+    kind: str  # 'block', 'lesson' or 'own' (a lesson of the current user)
+    hour: str  # '9:00' or '9:00-24:00' for blocks
+    label: str = ''  # alias or name of the student (admin only)
+    contact: str = ''  # telegram nickname without '@' (admin only)
+    pk: int = None
+    lesson: object = None  # for the lesson modal (admin only)
+
+
+def format_hour(value):
+    return f'{value.hour}:{value.minute:02}'
+
+
+def build_schedule(days, lessons, blocks, user):
+    """ Rows of every day sorted by time, a block goes before a lesson
+    starting at the same time. Lessons must come with student__details
+    for the admin """
+
+    schedule = {day: [] for day in days}
+    for block in blocks:
+        if block.date not in schedule:
+            continue
+        end = ('24:00' if block.end_time == time(23)
+               else format_hour(block.end_time))
+        schedule[block.date].append((block.start_time, 0, ScheduleRow(
+            'block', f'{format_hour(block.start_time)}-{end}', pk=block.pk
+        )))
+    for lesson in lessons:
+        if lesson.date not in schedule:
+            continue
+        kind = 'own' if lesson.student_id == user.pk else 'lesson'
+        if user.is_staff:
+            details = getattr(lesson.student, 'details', None)
+            alias = details.alias if details else None
+            telegram = details.telegram if details else None
+            row = ScheduleRow(
+                kind, format_hour(lesson.time),
+                label=alias or lesson.student.first_name,
+                contact=(telegram or '').lstrip('@'),
+                pk=lesson.pk, lesson=lesson,
+            )
+        else:
+            row = ScheduleRow(kind, format_hour(lesson.time), pk=lesson.pk)
+        schedule[lesson.date].append((lesson.time, 1, row))
+    return {
+        day: [row for _time, _order, row in sorted(items,
+                                                   key=lambda i: i[:2])]
+        for day, items in schedule.items()
+    }
+
+
+def calculate_salary(time, lessons_that_day, usual_cost=None, high_cost=None):
+    """ Lesson cost: high cost for the early morning, the late evening and
+    for the full day, usual cost otherwise. Costs of the student fall back to
+    the common ones """
+
+    is_morning = С_morning_time <= time < С_morning_time_markup
+    is_evening = C_evening_time_markup < time <= C_evening_time
+    is_over = lessons_that_day >= C_lesson_threshold - 1
+    if is_morning or is_evening or is_over:
+        return high_cost or C_salary_high
+    return usual_cost or C_salary_common
+
+
+def get_high_cost_condition():
+    """ The high cost rules of calculate_salary as a condition on lessons
+    for queryset updates. Lessons of the same day booked before the lesson
+    (a smaller id) stand for lessons_that_day """
+
+    booked_before = Lesson.objects.filter(
+        date=OuterRef('date'), pk__lt=OuterRef('pk')
+    ).order_by().values('date').annotate(amount=Count('pk')).values('amount')
+    return (
+        Q(time__gte=С_morning_time, time__lt=С_morning_time_markup)
+        | Q(time__gt=C_evening_time_markup, time__lte=C_evening_time)
+        | Q(GreaterThanOrEqual(Coalesce(Subquery(booked_before), 0),
+                               C_lesson_threshold - 1))
+    )
+
+
+def find_conflict(day, hour, lessons=None):
+    """ The first collision of a new lesson at the hour (time) of the day:
+    ('lesson', time of the lesson), ('block', start time of the block) or
+    None. Lessons and blocks are checked by one query: UNION ALL of both
+    tables (by the date indexes) stopped at the first row """
+
+    lessons = Lesson.objects.all() if lessons is None else lessons
+    started = datetime.combine(day, hour) - C_lesson_duration
+    if started.date() < day:
+        lessons = lessons.filter(date=day, time__lte=hour)
+    else:
+        lessons = lessons.filter(date=day, time__gt=started.time(),
+                                 time__lte=hour)
+    blocked = Q(start_time__lte=hour, end_time__gt=hour)
+    if hour == time(23):  # a block to the end of the day
+        blocked |= Q(end_time=hour)
+    blocks = TimeBlock.objects.filter(blocked, date=day)
+
+    query = lessons.annotate(
+        kind=Value('lesson', CharField()), at=F('time')
+    ).values_list('kind', 'at').order_by().union(
+        blocks.annotate(
+            kind=Value('block', CharField()), at=F('start_time')
+        ).values_list('kind', 'at').order_by(),
+        all=True
+    ).order_by('-kind')  # lessons first
+    return next(iter(query[:1]), None)
+
+
+def get_conflict_message(conflict):
+    kind, time = conflict
+    if kind == 'lesson':
+        return _("Some lesson is already scheduled for {} that day").format(
+            time)
+    return _("This time is blocked")
+
+
+def get_user_details(request):
+    """ UserDetail of request.user (None for anonymous or users without
+    details), loaded at most once per request. Session users come with the
+    details (see backends.UserDetailsBackend), API users by a token need
+    one query """
+
+    request = getattr(request, '_request', request)  # DRF request
+    if not hasattr(request, '_user_details'):
+        user = request.user
+        details = None
+        if user.is_authenticated:
+            try:
+                details = user.details
+            except (AttributeError, ObjectDoesNotExist):
+                details = UserDetail.objects.filter(user_id=user.pk).first()
+        request._user_details = details
+    return request._user_details
+
+
+SCHEDULE_VERSION_KEY = 'schedule_version'
+STUDENTS_VERSION_KEY = 'students_version'
+
+
+def get_version(key):
+    """ Version of data for cache keys. It starts from the current
+    timestamp, so a cleared cache doesn't repeat versions """
+
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, int(time_module.time()), None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        get_version(key)
+
+
+def get_schedule_version():
+    """ Version of the schedule (lessons and blocks) """
+
+    return get_version(SCHEDULE_VERSION_KEY)
+
+
+def bump_schedule_version():
+    """ Must be called after every change of lessons or blocks """
+
+    bump_version(SCHEDULE_VERSION_KEY)
+
+
+def delete_rows(model, pks):
+    """ Deletes the rows by one DELETE statement, returns the amount. Unlike
+    QuerySet.delete() the rows aren't fetched and no signals are sent, so
+    the caller updates the summaries and the schedule version. Only for
+    models without relations to them (nothing to cascade) """
+
+    pks = list(pks)
+    if not pks:
+        return 0
+    connection = connections[router.db_for_write(model)]
+    quote = connection.ops.quote_name
+    placeholders = ', '.join(['%s'] * len(pks))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {quote(model._meta.db_table)} '
+            f'WHERE {quote(model._meta.pk.column)} IN ({placeholders})',
+            pks
+        )
+        return cursor.rowcount
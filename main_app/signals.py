@@ -0,0 +1,71 @@
+from django.db.models.signals import (
+    pre_save, post_save, pre_delete, post_delete
+)
+from django.dispatch import receiver
+
+from .models import Lesson, TimeBlock, User, UserDetail
+from .reports import (
+    apply_lesson, get_usual_cost, is_high_cost, remove_archived_lessons
+)
+from .services import (
+    bump_schedule_version, bump_version, STUDENTS_VERSION_KEY
+)
+
+
+@receiver(pre_save, sender=Lesson)
+def remember_lesson_state(sender, instance, **kwargs):
+    """ Keeps the stored values of an updated lesson for the summaries and
+    classifies the lesson when its salary is set, so later changes of the
+    student costs don't change the class of the lesson """
+
+    origin = None
+    if not instance._state.adding:
+        origin = sender.objects.filter(pk=instance.pk).values(
+            'date', 'salary', 'high_cost'
+        ).first()
+    instance._summary_origin = origin
+    if origin is None or origin['salary'] != instance.salary:
+        instance.high_cost = is_high_cost(
+            instance.salary, get_usual_cost(instance.student_id)
+        )
+
+
+@receiver(post_save, sender=Lesson)
+def add_lesson_to_summaries(sender, instance, created, **kwargs):
+    origin = getattr(instance, '_summary_origin', None)
+    if origin:
+        apply_lesson(origin['date'], origin['salary'], origin['high_cost'],
+                     sign=-1)
+    apply_lesson(instance.date, instance.salary, instance.high_cost)
+
+
+@receiver(post_delete, sender=Lesson)
+def remove_lesson_from_summaries(sender, instance, **kwargs):
+    apply_lesson(instance.date, instance.salary, instance.high_cost, sign=-1)
+
+
+@receiver(pre_delete, sender=User)
+def remove_student_archive_from_summaries(sender, instance, **kwargs):
+    """ The archived lessons are deleted by cascade without signals """
+
+    remove_archived_lessons(instance.pk)
+
+
+@receiver(post_save, sender=Lesson)
+@receiver(post_delete, sender=Lesson)
+@receiver(post_save, sender=TimeBlock)
+@receiver(post_delete, sender=TimeBlock)
+def change_schedule_version(sender, **kwargs):
+    bump_schedule_version()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+@receiver(post_save, sender=UserDetail)
+@receiver(post_delete, sender=UserDetail)
+def change_students_version(sender, update_fields=None, **kwargs):
+    """ Rebuilds the autocomplete index of students, but not on login """
+
+    if update_fields and set(update_fields) == {'last_login'}:
+        return
+    bump_version(STUDENTS_VERSION_KEY)
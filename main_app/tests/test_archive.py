@@ -0,0 +1,85 @@
+from datetime import date, time, timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import override_settings
+from django.test.testcases import TestCase
+from django.contrib.auth.models import User
+
+from main_app.archive import archive_lessons
+from main_app.models import (
+    Lesson, LessonArchive, UserDetail, DailySummary, MonthlySummary
+)
+from main_app.reports import rebuild_summaries
+from spacepython.constraints import C_salary_common
+
+
+@override_settings(LESSON_ARCHIVE_DAYS=100)
+class TestLessonArchive(TestCase):
+    """ Testing archiving of old lessons """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(username='admin', is_staff=True,
+                                             is_superuser=True)
+        cls.student = User.objects.create_user(username='student')
+        UserDetail.objects.create(user=cls.student)
+        cls.old_day = date.today() - timedelta(days=200)
+        for day in (cls.old_day, cls.old_day, date.today()):
+            Lesson.objects.create(student=cls.student, date=day,
+                                  time=time(hour=Lesson.objects.count() + 9),
+                                  salary=C_salary_common)
+
+    def test_archive(self):
+        self.assertEqual(archive_lessons(batch_size=1), 2)
+        self.assertEqual(Lesson.objects.count(), 1)
+        self.assertEqual(LessonArchive.objects.count(), 2)
+        self.assertEqual(DailySummary.objects.get(date=self.old_day).lessons,
+                         2)
+
+    def test_command(self):
+        out = StringIO()
+        call_command('archive_lessons', days=300, stdout=out)
+        self.assertIn('0 lessons', out.getvalue())
+        call_command('archive_lessons', stdout=out)
+        self.assertIn('2 lessons', out.getvalue())
+
+    @staticmethod
+    def get_summaries():
+        # the incremental updates leave the emptied rows, the rebuild doesn't
+        return [
+            list(model.objects.exclude(lessons=0).order_by(key).values(
+                key, 'lessons', 'revenue', 'occupied_hours',
+                'high_cost_lessons'
+            ))
+            for model, key in ((DailySummary, 'date'),
+                               (MonthlySummary, 'month'))
+        ]
+
+    def test_delete_student(self):
+        other = User.objects.create_user(username='other')
+        Lesson.objects.create(student=other, date=self.old_day,
+                              time=time(hour=20), salary=1500)
+        archive_lessons()
+
+        self.student.delete()
+        summaries = self.get_summaries()
+        rebuild_summaries()
+        self.assertEqual(summaries, self.get_summaries())
+        self.assertEqual(DailySummary.objects.get(date=self.old_day).lessons,
+                         1)
+
+    def test_history_reads_both_tables(self):
+        archive_lessons()
+        rebuild_summaries()
+        self.assertEqual(DailySummary.objects.get(date=self.old_day).lessons,
+                         2)
+
+        self.client.force_login(self.admin)
+        response = self.client.get('/api/all-lessons/')
+        self.assertEqual(len(response.json()), 3)
+        self.assertEqual(response.json()[0]['date'], self.old_day.isoformat())
+
+        response = self.client.get('/api/export/lessons.csv')
+        content = b''.join(response.streaming_content).decode()
+        self.assertEqual(len(content.splitlines()), 4)
@@ -0,0 +1,68 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test.testcases import TestCase
+
+from main_app import autocomplete
+from main_app.autocomplete import get_index, search_students
+from main_app.models import UserDetail
+
+
+class TestStudentAutocomplete(TestCase):
+    """ Testing the prefix index of students and its invalidation """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(username='admin', is_staff=True)
+        cls.ivan = User.objects.create_user(username='ivan',
+                                            first_name='Ivan Petrov')
+        UserDetail.objects.create(user=cls.ivan, alias='Vanya',
+                                  phone='79990001122', telegram='@ivan_p')
+        cls.olga = User.objects.create_user(username='olga',
+                                            first_name='Olga')
+        UserDetail.objects.create(user=cls.olga)
+        inactive = User.objects.create_user(username='old', first_name='Ivan',
+                                            is_active=False)
+        UserDetail.objects.create(user=inactive)
+
+    def setUp(self):
+        cache.clear()
+        autocomplete._index = None
+
+    def test_prefixes(self):
+        label = 'Vanya (Ivan Petrov)'
+        for prefix in ('iv', 'IVAN P', 'petr', 'van', '7999', '@ivan',
+                       'ivan_'):
+            self.assertEqual(search_students(prefix),
+                             [(self.ivan.pk, label)], prefix)
+        self.assertEqual(search_students('x'), [])
+        self.assertEqual(search_students(''),
+                         [(self.olga.pk, 'Olga'), (self.ivan.pk, label)])
+        self.assertEqual(len(search_students('', limit=1)), 1)
+
+    def test_no_queries(self):
+        get_index()
+        with self.assertNumQueries(0):
+            search_students('o')
+
+    def test_invalidation(self):
+        index = get_index()
+        self.client.force_login(self.olga)  # last_login only
+        self.assertIs(get_index(), index)
+
+        self.olga.details.alias = 'Olya'
+        self.olga.details.save()
+        self.assertEqual(search_students('oly'), [(self.olga.pk,
+                                                   'Olya (Olga)')])
+        self.olga.delete()
+        self.assertEqual(search_students('oly'), [])
+
+    def test_api(self):
+        url = '/api/admin/admin-panel/autocomplete/students'
+        self.client.force_login(self.olga)
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+        self.client.force_login(self.admin)
+        response = self.client.get(url, {'q': 'vanya', 'limit': 'x'})
+        self.assertEqual(response.json(), [
+            {'id': self.ivan.pk, 'label': 'Vanya (Ivan Petrov)'}
+        ])
@@ -0,0 +1,239 @@
+from datetime import time, timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.testcases import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from main_app.bulk import (
+    cancel_lessons, delete_blocks, reassign_lessons, reprice_lessons,
+    shift_lessons
+)
+from main_app.models import DailySummary, Lesson, TimeBlock, UserDetail
+from main_app.services import get_schedule_version
+
+
+class TestBulkActions(TestCase):
+    """ Testing bulk actions of the admin on lessons and blocks """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(username='admin', is_staff=True,
+                                             is_superuser=True)
+        UserDetail.objects.create(user=cls.admin)
+        cls.student = User.objects.create_user(username='student')
+        UserDetail.objects.create(user=cls.student)
+        cls.other = User.objects.create_user(username='other')
+        UserDetail.objects.create(user=cls.other, usual_cost=500)
+        cls.day = timezone.localdate() + timedelta(days=1)
+        cls.lessons = [
+            Lesson.objects.create(student=cls.student, date=cls.day,
+                                  time=time(hour), salary=1000)
+            for hour in (10, 12, 14)
+        ]
+        cls.blocks = [
+            TimeBlock.objects.create(date=cls.day + timedelta(days=1),
+                                     start_time=time(hour),
+                                     end_time=time(hour + 1))
+            for hour in (8, 18)
+        ]
+
+    def ids(self, lessons):
+        return [lesson.pk for lesson in lessons]
+
+    def assertSummary(self, day, lessons):
+        summary = DailySummary.objects.filter(date=day).first()
+        self.assertEqual(summary.lessons if summary else 0, lessons)
+
+    def lesson_writes(self, queries):
+        return [query['sql'] for query in queries.captured_queries
+                if query['sql'].startswith(('UPDATE "main_app_lesson"',
+                                            'DELETE FROM "main_app_lesson"'))]
+
+    def test_cancel(self):
+        version = get_schedule_version()
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(cancel_lessons(self.day), 3)
+        self.assertEqual(len(self.lesson_writes(queries)), 1)
+        self.assertFalse(Lesson.objects.exists())
+        self.assertSummary(self.day, 0)
+        self.assertEqual(get_schedule_version(), version + 1)
+
+    def test_delete_blocks(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(delete_blocks([self.blocks[0].pk]), 1)
+        self.assertEqual(list(TimeBlock.objects.all()), self.blocks[1:])
+
+    def test_shift(self):
+        version = get_schedule_version()
+        with CaptureQueriesContext(connection) as queries:
+            moved = shift_lessons(self.ids(self.lessons[:2]), 2)
+        self.assertEqual(moved, 2)
+        self.assertEqual(len(self.lesson_writes(queries)), 1)
+        self.assertEqual(
+            list(Lesson.objects.values_list('date', flat=True)),
+            [self.day, self.day + timedelta(days=2),
+             self.day + timedelta(days=2)]
+        )
+        self.assertSummary(self.day, 1)
+        self.assertSummary(self.day + timedelta(days=2), 2)
+        self.assertEqual(get_schedule_version(), version + 1)
+
+    def test_shift_errors(self):
+        with self.assertRaisesMessage(ValueError, 'past'):
+            shift_lessons(self.ids(self.lessons), -5)
+        # the block from 8 to 9 the next day
+        Lesson.objects.filter(pk=self.lessons[0].pk).update(time=time(8))
+        with self.assertRaisesMessage(ValueError, '08:00'):
+            shift_lessons(self.ids(self.lessons), 1)
+        self.assertFalse(Lesson.objects.exclude(date=self.day).exists())
+
+    def test_reassign(self):
+        self.assertEqual(
+            reassign_lessons(self.ids(self.lessons[:2]), self.other.pk), 2
+        )
+        self.assertEqual(Lesson.objects.filter(student=self.other).count(), 2)
+        # the lessons keep their class though 1000 is above the usual cost
+        # of the other student
+        self.assertEqual(
+            DailySummary.objects.get(date=self.day).high_cost_lessons, 0
+        )
+        with self.assertRaises(ValueError):
+            reassign_lessons(self.ids(self.lessons), self.admin.pk)
+
+    def test_admin_panel(self):
+        self.client.force_login(self.admin)
+        response = self.client.get(f'/admin-panel/students/{self.student.pk}')
+        self.assertContains(response, 'name="lessons"', count=6)
+        response = self.client.get('/admin-panel/block-time')
+        self.assertContains(response, 'name="cancel lessons"', count=2)
+        self.client.post(f'/admin-panel/students/{self.student.pk}', {
+            'lessons': self.ids(self.lessons[1:]), 'days': '3',
+            'shift lessons': '1'
+        })
+        self.assertEqual(
+            Lesson.objects.filter(date=self.day + timedelta(days=3)).count(),
+            2
+        )
+        self.client.post('/admin-panel/block-time', {
+            'blocks': self.ids(self.blocks), 'delete blocks': '1'
+        })
+        self.assertFalse(TimeBlock.objects.exists())
+        self.client.post('/admin-panel/block-time', {
+            'date': self.day.isoformat(), 'cancel lessons': '1'
+        })
+        self.assertEqual(Lesson.objects.count(), 2)
+
+    def test_admin_panel_implicit_submit(self):
+        """ Enter in the inputs of the bulk form submits no action """
+
+        self.client.force_login(self.admin)
+        url = f'/admin-panel/students/{self.student.pk}'
+        response = self.client.get(url)
+        # the disabled default button goes before the delete buttons
+        content = response.content.decode()
+        self.assertLess(content.index('default-submit'),
+                        content.index('name="delete lesson"'))
+        response = self.client.post(url, {
+            'lessons': self.ids(self.lessons), 'days': '3', 'filter': 'x'
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Lesson.objects.filter(date=self.day).count(), 3)
+
+    def test_api(self):
+        self.client.force_login(self.admin)
+        response = self.client.post(
+            '/api/all-lessons/reassign/',
+            {'lessons': self.ids(self.lessons), 'student': self.other.pk},
+            content_type='application/json'
+        )
+        self.assertEqual(response.json(), {'lessons': 3})
+        response = self.client.post(
+            '/api/all-lessons/shift/',
+            {'lessons': self.ids(self.lessons), 'days': -5},
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post(
+            '/api/admin/admin-panel/timeblock/bulk-delete/',
+            {'blocks': self.ids(self.blocks)}, content_type='application/json'
+        )
+        self.assertEqual(response.json(), {'blocks': 2})
+        response = self.client.post(
+            '/api/all-lessons/cancel/', {'date': self.day.isoformat()},
+            content_type='application/json'
+        )
+        self.assertEqual(response.json(), {'lessons': 3})
+
+
+class TestReprice(TestCase):
+    """ Testing repricing of future lessons by the costs of students """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(username='admin', is_staff=True,
+                                             is_superuser=True)
+        cls.student = User.objects.create_user(username='student')
+        UserDetail.objects.create(user=cls.student, usual_cost=2000,
+                                  high_cost=2500)
+        cls.day = timezone.localdate() + timedelta(days=1)
+        cls.past = Lesson.objects.create(
+            student=cls.student, date=cls.day - timedelta(days=2),
+            time=time(12), salary=1000
+        )
+        # 9:00 is the morning, 4 lessons are booked before the 5th at 17:00
+        cls.lessons = [
+            Lesson.objects.create(student=cls.student, date=cls.day,
+                                  time=time(hour), salary=1000)
+            for hour in (9, 12, 14, 15, 17)
+        ]
+
+    def test_rules(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(reprice_lessons([self.student.pk]), 5)
+        updates = [query['sql'] for query in queries.captured_queries
+                   if query['sql'].startswith('UPDATE "main_app_lesson"')]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(
+            list(Lesson.objects.filter(date=self.day).values_list(
+                'salary', flat=True
+            )),
+            [2500, 2000, 2000, 2000, 2500]
+        )
+        self.past.refresh_from_db()
+        self.assertEqual(self.past.salary, 1000)
+        self.assertEqual(DailySummary.objects.get(date=self.day).revenue,
+                         11000)
+        # nothing to change
+        self.assertEqual(reprice_lessons([self.student.pk]), 0)
+
+    def test_admin_panel_and_api(self):
+        self.client.force_login(self.admin)
+        self.client.post(f'/admin-panel/students/{self.student.pk}', {
+            'pk': self.student.pk, 'first_name': 'Student',
+            'usual_cost': 2000, 'high_cost': 2500, 'is_active': 'on',
+            'reprice_lessons': 'on'
+        })
+        self.assertEqual(Lesson.objects.filter(salary=2000).count(), 3)
+
+        response = self.client.patch(
+            f'/api/admin/admin-panel/students/{self.student.pk}/',
+            {'usual_cost': 1500, 'reprice_lessons': True},
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['repriced_lessons'], 3)
+        self.assertEqual(Lesson.objects.filter(salary=1500).count(), 3)
+        response = self.client.patch(
+            f'/api/admin/admin-panel/students/{self.student.pk}/',
+            {'first_name': 'Student'}, content_type='application/json'
+        )
+        self.assertIsNone(response.json()['repriced_lessons'])
+
+        UserDetail.objects.filter(user=self.student).update(usual_cost=1200)
+        response = self.client.post(
+            '/api/admin/admin-panel/students/reprice/',
+            {'students': [self.student.pk]}, content_type='application/json'
+        )
+        self.assertEqual(response.json(), {'lessons': 3})
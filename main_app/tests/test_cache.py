@@ -0,0 +1,83 @@
+import threading
+from unittest import mock
+
+from django.core.cache import caches
+from django.test import SimpleTestCase
+
+from spacepython.cache import TieredCache
+
+
+class TestTieredCache(SimpleTestCase):
+    """ Testing the per-process tier in front of the shared cache """
+
+    def setUp(self):
+        caches['shared'].clear()
+        self.cache = self.create_cache()
+
+    @staticmethod
+    def create_cache(**options):
+        return TieredCache('', {'OPTIONS': {
+            'SHARED': 'shared', 'LOCAL_TIMEOUT': 5, **options
+        }})
+
+    def test_hits_and_misses(self):
+        self.assertIsNone(self.cache.get('key'))
+        self.cache.set('key', [1])
+        self.assertEqual(self.cache.get('key'), [1])
+
+        other = self.create_cache()  # another process
+        self.assertEqual(other.get('key'), [1])
+        self.assertEqual(other.get('key'), [1])
+
+        self.assertEqual(self.cache.get_stats()['local_hits'], 1)
+        self.assertEqual(self.cache.get_stats()['misses'], 1)
+        self.assertEqual(other.get_stats()['shared_hits'], 1)
+        self.assertEqual(other.get_stats()['local_hits'], 1)
+
+    def test_stats_of_threads(self):
+        self.cache.set('key', 1)
+
+        def read():
+            for _i in range(1000):
+                self.cache.get('key')
+                self.cache.get('missing')
+
+        threads = [threading.Thread(target=read) for _i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stats = self.cache.get_stats()
+        self.assertEqual((stats['local_hits'], stats['misses']),
+                         (8000, 8000))
+
+    def test_local_copy(self):
+        self.cache.set('key', [1])
+        self.cache.get('key').append(2)
+        self.assertEqual(self.cache.get('key'), [1])
+
+    def test_local_timeout(self):
+        other = self.create_cache()
+        self.cache.set('key', 1)
+        other.get('key')
+        self.cache.set('key', 2)
+        self.assertEqual(other.get('key'), 1)  # not expired locally yet
+        with mock.patch('spacepython.cache.time.monotonic',
+                        return_value=10 ** 9):
+            self.assertEqual(other.get('key'), 2)
+
+    def test_lru_eviction(self):
+        cache = self.create_cache(LOCAL_MAX_ENTRIES=2)
+        for key in ('a', 'b', 'c'):
+            cache.set(key, key)
+        self.assertEqual(cache.get_stats()['local_entries'], 2)
+        self.assertEqual(cache.get('a'), 'a')  # from the shared cache
+        self.assertEqual(cache.get_stats()['shared_hits'], 1)
+
+    def test_incr_and_delete(self):
+        self.cache.add('counter', 1)
+        self.assertEqual(self.cache.incr('counter'), 2)
+        self.assertEqual(self.cache.get('counter'), 2)
+        self.cache.delete('counter')
+        self.assertIsNone(self.cache.get('counter'))
+        self.assertNotIn('counter', self.cache)
@@ -0,0 +1,83 @@
+from datetime import date, time, timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.utils import timezone
+from django.test.testcases import TestCase
+from django.contrib.auth.models import User
+
+from main_app.calendar_feeds import get_feed_token
+from main_app.models import Lesson, UserDetail, TimeBlock
+from spacepython.constraints import C_salary_common
+
+
+class TestCalendarFeeds(TestCase):
+    """ Testing iCalendar feeds of students and admin """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(username='admin', is_staff=True,
+                                             is_superuser=True)
+        cls.student = User.objects.create_user(username='student',
+                                               first_name='Ivan')
+        UserDetail.objects.create(user=cls.student, alias='vanya')
+        other = User.objects.create_user(username='other')
+        day = date.today() + timedelta(days=1)
+        cls.lesson = Lesson.objects.create(student=cls.student, date=day,
+                                           time=time(hour=15),
+                                           salary=C_salary_common)
+        cls.other_lesson = Lesson.objects.create(student=other, date=day,
+                                                 time=time(hour=17),
+                                                 salary=C_salary_common)
+        cls.block = TimeBlock.objects.create(date=day,
+                                             start_time=time(hour=8),
+                                             end_time=time(hour=12))
+
+    def setUp(self):
+        cache.clear()
+
+    def get_feed(self, user, **headers):
+        return self.client.get(f'/calendar/{get_feed_token(user)}.ics',
+                               **headers)
+
+    def test_student_feed(self):
+        response = self.get_feed(self.student)
+        self.assertEqual(response.status_code, 200)
+        content = response.content.decode()
+        self.assertIn(f'UID:lesson-{self.lesson.pk}@', content)
+        self.assertNotIn(f'UID:lesson-{self.other_lesson.pk}@', content)
+        self.assertNotIn('block', content)
+
+    def test_admin_feed(self):
+        content = self.get_feed(self.admin).content.decode()
+        self.assertIn(f'UID:lesson-{self.other_lesson.pk}@', content)
+        self.assertIn(f'UID:block-{self.block.pk}@', content)
+        self.assertIn('vanya (Ivan)', content)
+
+    def test_cache_and_etag(self):
+        etag = self.get_feed(self.student)['ETag']
+        with self.assertNumQueries(0):
+            response = self.get_feed(self.student)
+            self.assertEqual(response.status_code, 200)
+            response = self.get_feed(self.student, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 304)
+
+        Lesson.objects.create(student=self.student, date=date.today(),
+                              time=time(hour=20), salary=C_salary_common)
+        response = self.get_feed(self.student, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_midnight(self):
+        etag = self.get_feed(self.student)['ETag']
+        tomorrow = timezone.localdate() + timedelta(days=1)
+        with mock.patch('main_app.services.timezone.localdate',
+                        return_value=tomorrow):
+            response = self.get_feed(self.student, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_wrong_token(self):
+        token = get_feed_token(self.student).replace('student', 'admin')
+        response = self.client.get(f'/calendar/{token}.ics')
+        self.assertEqual(response.status_code, 404)
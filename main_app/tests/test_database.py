@@ -0,0 +1,104 @@
+from unittest import mock, skipUnless
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+
+from main_app.models import Lesson, TimeBlock
+from spacepython.routers import (
+    PIN_COOKIE, PrimaryReplicaRouter, ReplicaRoutingMiddleware
+)
+
+
+@skipUnless(connection.vendor == 'sqlite'
+            and settings.SQLITE_PROFILE == 'production',
+            'SQLite production profile only')
+class TestSQLiteProfile(TransactionTestCase):
+    """ Testing the production profile of the SQLite backend """
+
+    def test_pragmas(self):
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA synchronous')
+            self.assertEqual(cursor.fetchone()[0], 1)  # NORMAL
+            cursor.execute('PRAGMA busy_timeout')
+            self.assertEqual(cursor.fetchone()[0], 5000)
+
+    def test_immediate_transactions(self):
+        with CaptureQueriesContext(connection) as queries:
+            with transaction.atomic():
+                TimeBlock.objects.exists()
+        self.assertEqual(queries[0]['sql'], 'BEGIN IMMEDIATE')
+
+
+@skipUnless(connection.vendor == 'postgresql', 'PostgreSQL only')
+class TestPostgreSQL(TransactionTestCase):
+    """ Testing the PostgreSQL mode (DATABASE_URL) """
+
+    def test_persistent_connections(self):
+        self.assertGreater(connection.settings_dict['CONN_MAX_AGE'], 0)
+        self.assertTrue(connection.settings_dict['CONN_HEALTH_CHECKS'])
+
+    def test_archive_date_index(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT indexdef FROM pg_indexes "
+                "WHERE indexname = 'main_app_lessonarchive_date_brin'"
+            )
+            self.assertIn('brin', cursor.fetchone()[0])
+
+    def test_server_side_cursor(self):
+        with transaction.atomic():
+            rows = TimeBlock.objects.iterator(chunk_size=10)
+            next(rows, None)
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT count(*) FROM pg_cursors')
+                self.assertEqual(cursor.fetchone()[0], 1)
+
+
+@mock.patch('spacepython.routers.replica_enabled', return_value=True)
+class TestReplicaRouting(SimpleTestCase):
+    """ Testing routing of reads to the replica and read-your-writes """
+
+    router = PrimaryReplicaRouter()
+
+    def get_response(self, request, write=False):
+        """ Runs the request through the middleware and returns databases
+        of the reads made before and after the optional write """
+
+        reads = []
+
+        def view(request):
+            reads.append(self.router.db_for_read(Lesson))
+            if write:
+                self.router.db_for_write(Lesson)
+            reads.append(self.router.db_for_read(Lesson))
+            return HttpResponse()
+
+        return ReplicaRoutingMiddleware(view)(request), reads
+
+    def test_outside_request(self, _replica_enabled):
+        self.assertEqual(self.router.db_for_read(Lesson), 'default')
+
+    def test_safe_request(self, _replica_enabled):
+        response, reads = self.get_response(RequestFactory().get('/'))
+        self.assertEqual(reads, ['replica', 'replica'])
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+    def test_read_your_writes(self, _replica_enabled):
+        response, reads = self.get_response(RequestFactory().get('/'),
+                                            write=True)
+        self.assertEqual(reads, ['replica', 'default'])
+        self.assertIn(PIN_COOKIE, response.cookies)
+
+        request = RequestFactory().get('/')
+        request.COOKIES[PIN_COOKIE] = '1'
+        response, reads = self.get_response(request)
+        self.assertEqual(reads, ['default', 'default'])
+
+    def test_unsafe_request(self, _replica_enabled):
+        response, reads = self.get_response(RequestFactory().post('/'),
+                                            write=True)
+        self.assertEqual(reads, ['default', 'default'])
+        self.assertIn(PIN_COOKIE, response.cookies)
@@ -0,0 +1,73 @@
+import csv
+import json
+from datetime import date, time, timedelta
+
+from django.test.testcases import TestCase
+from django.contrib.auth.models import User
+
+from main_app.models import Lesson, UserDetail
+from spacepython.constraints import C_salary_common
+
+
+class TestLessonsExport(TestCase):
+    """ Testing streaming export of the lesson history """
+
+    admin_credentials = {
+        'username': 'admin',
+        'password': 'admin'
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        User.objects.create_user(**cls.admin_credentials, is_staff=True,
+                                 is_superuser=True)
+        cls.student = User.objects.create_user(username='student',
+                                               first_name='Ivan')
+        UserDetail.objects.create(user=cls.student, alias='ivan',
+                                  telegram='@ivan')
+        other = User.objects.create_user(username='other')
+        for days, student in ((-30, cls.student), (-1, other),
+                              (1, cls.student)):
+            Lesson.objects.create(
+                student=student,
+                date=date.today() + timedelta(days=days),
+                time=time(hour=15),
+                salary=C_salary_common
+            )
+
+    def setUp(self):
+        self.client.login(**self.admin_credentials)
+
+    def get_content(self, response):
+        return b''.join(response.streaming_content).decode()
+
+    def test_csv_export(self):
+        response = self.client.get('/api/export/lessons.csv')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        rows = list(csv.reader(self.get_content(response).splitlines()))
+        self.assertEqual(rows[0][0], 'id')
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows[1][5:8], ['Ivan', 'ivan', ''])
+
+    def test_ndjson_export_with_filters(self):
+        response = self.client.get('/api/export/lessons.ndjson', {
+            'date_from': (date.today() - timedelta(days=5)).isoformat(),
+            'student': self.student.pk
+        })
+        rows = [json.loads(line)
+                for line in self.get_content(response).splitlines()]
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['telegram'], '@ivan')
+
+    def test_wrong_params(self):
+        response = self.client.get('/api/export/lessons.csv',
+                                   {'date_to': '31-12-2022'})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get('/api/export/lessons.xml')
+        self.assertEqual(response.status_code, 404)
+
+    def test_export_for_student(self):
+        self.client.force_login(self.student)
+        response = self.client.get('/api/export/lessons.csv')
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,127 @@
+from datetime import date, time, timedelta
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test.testcases import TestCase
+from django.contrib.auth.models import User
+
+from main_app.imports import import_lessons, import_students, read_csv
+from main_app.models import Lesson, UserDetail, TimeBlock, DailySummary
+from spacepython.constraints import C_salary_common, C_salary_high
+
+
+class TestStudentsImport(TestCase):
+    """ Testing bulk import of students """
+
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user(username='existing')
+        UserDetail.objects.create(user=user, phone='89001234567',
+                                  telegram='@existing')
+
+    def test_import(self):
+        content = (
+            b'first_name,phone,telegram,alias,usual_cost\n'
+            b'Ivan,89001112233,@ivan,vanya,1200\n'
+            b'Petr,89001234567,,,\n'
+            b'Anna,,anna,,\n'
+            b'Olga,,@olga,,\n'
+            b',,@noname,,\n'
+            b'Olga 2,,@olga,,\n'
+        )
+        with self.assertNumQueries(6):
+            # uniqueness check and one transaction with users, details and
+            # tokens
+            report = import_students(read_csv(content))
+
+        self.assertEqual(report.created, 2)
+        self.assertEqual([line for line, _msg in report.errors],
+                         [3, 4, 6, 7])
+        ivan = User.objects.get(details__telegram='@ivan')
+        self.assertEqual(ivan.details.usual_cost, 1200)
+        self.assertTrue(ivan.auth_token.key)
+
+    def test_single_contact(self):
+        user = User.objects.create_user(username='telegram_only')
+        UserDetail.objects.create(user=user, telegram='@telegram_only')
+        content = (
+            b'first_name,phone,telegram\n'
+            b'Ivan,89001112233,\n'
+            b'Petr,89001112244,\n'
+            b'Anna,,@anna\n'
+            b'Olga,,@olga\n'
+            b'Olga 2,,@telegram_only\n'
+        )
+        report = import_students(read_csv(content))
+
+        self.assertEqual(report.created, 4)
+        self.assertEqual([line for line, _msg in report.errors], [6])
+        self.assertEqual(
+            UserDetail.objects.filter(telegram__isnull=True).count(), 2
+        )
+
+    def test_dry_run(self):
+        content = b'first_name,phone,telegram\nIvan,89001112233,@ivan\n'
+        report = import_students(read_csv(content), dry_run=True)
+        self.assertEqual(report.created, 1)
+        self.assertFalse(UserDetail.objects.filter(telegram='@ivan'))
+
+
+class TestLessonsImport(TestCase):
+    """ Testing bulk import of lessons """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = User.objects.create_user(username='student')
+        UserDetail.objects.create(user=cls.student, telegram='@student',
+                                  usual_cost=1100)
+        cls.day = date.today() + timedelta(days=1)
+        Lesson.objects.create(student=cls.student, date=cls.day,
+                              time=time(hour=15), salary=C_salary_common)
+        TimeBlock.objects.create(date=cls.day, start_time=time(hour=18),
+                                 end_time=time(hour=20))
+
+    def test_import(self):
+        day = self.day.isoformat()
+        content = (
+            'date,time,salary,student_id,telegram\n'
+            f'{day},12,,,@student\n'
+            f'{day},9:00,,{self.student.pk},\n'
+            f'{day},15,,,@student\n'
+            f'{day},19,,,@student\n'
+            f'{day},12,,,@student\n'
+            f'{day},13,,,@nobody\n'
+            f'{day},xx,,,@student\n'
+            f'{day},14,1500,,@student\n'
+        ).encode()
+        report = import_lessons(read_csv(content))
+
+        self.assertEqual(report.created, 3)
+        self.assertEqual([line for line, _msg in report.errors],
+                         [4, 5, 6, 7, 8])
+        salaries = dict(Lesson.objects.filter(date=self.day).values_list(
+            'time', 'salary'))
+        self.assertEqual(salaries[time(hour=12)], 1100)
+        self.assertEqual(salaries[time(hour=9)], C_salary_high)
+        self.assertEqual(salaries[time(hour=14)], 1500)
+        self.assertEqual(DailySummary.objects.get(date=self.day).lessons, 4)
+
+
+class TestImportAP(TestCase):
+    """ Testing csv upload in the admin panel """
+
+    def setUp(self):
+        admin = User.objects.create_user(username='admin', is_staff=True,
+                                         is_superuser=True)
+        self.client.force_login(admin)
+
+    def test_upload(self):
+        file = SimpleUploadedFile(
+            'students.csv', b'first_name,telegram\nIvan,@ivan\nPetr,petr\n'
+        )
+        response = self.client.post('/admin-panel/import', {
+            'kind': 'students',
+            'file': file,
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['report'].errors), 1)
+        self.assertTrue(UserDetail.objects.filter(telegram='@ivan'))
@@ -0,0 +1,83 @@
+from datetime import date, time, timedelta
+
+from django.test.testcases import TestCase
+from django.contrib.auth.models import User
+
+from main_app.models import Lesson, UserDetail
+
+
+class TestJWT(TestCase):
+    """ Testing JWT authentication of the API """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = User.objects.create_user(username='student')
+        UserDetail.objects.create(user=cls.student, phone='79990000000')
+        cls.admin = User.objects.create_user(username='admin', is_staff=True)
+        UserDetail.objects.create(user=cls.admin, telegram='@admin')
+        Lesson.objects.create(student=cls.student,
+                              date=date.today() + timedelta(days=1),
+                              time=time(hour=15), salary=1000)
+
+    def get_tokens(self, **contacts):
+        response = self.client.post('/api/get-jwt', contacts)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_unknown_user(self):
+        response = self.client.post('/api/get-jwt', {'phone': '70000000000'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_no_auth_queries(self):
+        access = self.get_tokens(phone='79990000000')['access']
+        # the only query is the lesson list
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                '/api/set-my-lessons/', HTTP_AUTHORIZATION=f'Bearer {access}'
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 1)
+
+    def test_staff_claim(self):
+        tokens = self.get_tokens(telegram='@admin')
+        response = self.client.get(
+            '/api/get-users', HTTP_AUTHORIZATION=f'Bearer {tokens["access"]}'
+        )
+        self.assertEqual(response.status_code, 200)
+
+        student_access = self.get_tokens(phone='79990000000')['access']
+        response = self.client.get(
+            '/api/get-users', HTTP_AUTHORIZATION=f'Bearer {student_access}'
+        )
+        self.assertEqual(response.status_code, 403)
+
+    def test_refresh(self):
+        refresh = self.get_tokens(telegram='@admin')['refresh']
+        response = self.client.post('/api/refresh-jwt', {'refresh': refresh})
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(
+            '/api/get-users',
+            HTTP_AUTHORIZATION=f'Bearer {response.json()["access"]}'
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_refresh_reloads_user(self):
+        refresh = self.get_tokens(telegram='@admin')['refresh']
+        User.objects.filter(pk=self.admin.pk).update(is_staff=False)
+        response = self.client.post('/api/refresh-jwt', {'refresh': refresh})
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(
+            '/api/get-users',
+            HTTP_AUTHORIZATION=f'Bearer {response.json()["access"]}'
+        )
+        self.assertEqual(response.status_code, 403)
+
+        User.objects.filter(pk=self.admin.pk).update(is_active=False)
+        for url in ('/api/refresh-jwt', '/auth/jwt/refresh/'):
+            response = self.client.post(url, {'refresh': refresh})
+            self.assertEqual(response.status_code, 401)
+
+    def test_wrong_token(self):
+        response = self.client.get('/api/set-my-lessons/',
+                                   HTTP_AUTHORIZATION='Bearer wrong')
+        self.assertEqual(response.status_code, 403)
@@ -2,6 +2,7 @@
 
 from django.test.testcases import TestCase
 
+from main_app.backends import USER_DETAILS_BACKEND
 from main_app.models import UserDetail, User
 
 
@@ -100,7 +101,7 @@ class TestPagesLoadsByAuthenticatedUser(TestCase):
 
     def setUp(self):
         user = User.objects.get(details__phone=self.user_credentials['phone'])
-        self.client._login(user)
+        self.client._login(user, backend=USER_DETAILS_BACKEND)
 
     # pages for anonymous user
     def test_index_page(self):
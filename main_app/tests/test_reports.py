@@ -0,0 +1,131 @@
+from datetime import date, time, timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test.testcases import TestCase
+from django.contrib.auth.models import User
+
+from main_app.models import Lesson, UserDetail, DailySummary, MonthlySummary
+from spacepython.constraints import C_salary_common, C_salary_high
+
+
+class TestSummaries(TestCase):
+    """ Testing incremental maintenance of the revenue summaries """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = User.objects.create_user(username='student')
+        UserDetail.objects.create(user=cls.student)
+        cls.day = date.today() + timedelta(days=1)
+
+    def create_lesson(self, salary, hour=15, day=None):
+        return Lesson.objects.create(
+            student=self.student,
+            date=day or self.day,
+            time=time(hour=hour),
+            salary=salary
+        )
+
+    def test_lesson_creation(self):
+        self.create_lesson(C_salary_common)
+        self.create_lesson(C_salary_high, hour=9)
+
+        day = DailySummary.objects.get(date=self.day)
+        self.assertEqual(day.lessons, 2)
+        self.assertEqual(day.revenue, C_salary_common + C_salary_high)
+        self.assertEqual(day.occupied_hours, 2)
+        self.assertEqual(day.high_cost_share, 0.5)
+        month = MonthlySummary.objects.get(month=self.day.replace(day=1))
+        self.assertEqual(month.revenue, day.revenue)
+
+    def test_lesson_deletion(self):
+        self.create_lesson(C_salary_common)
+        self.create_lesson(C_salary_high, hour=9).delete()
+
+        day = DailySummary.objects.get(date=self.day)
+        self.assertEqual(day.lessons, 1)
+        self.assertEqual(day.revenue, C_salary_common)
+        self.assertEqual(day.high_cost_lessons, 0)
+
+    def test_lesson_update(self):
+        lesson = self.create_lesson(C_salary_common)
+        other_day = self.day + timedelta(days=1)
+        lesson.date = other_day
+        lesson.save()
+
+        self.assertEqual(DailySummary.objects.get(date=self.day).lessons, 0)
+        self.assertEqual(DailySummary.objects.get(date=other_day).lessons, 1)
+
+    def test_cost_change(self):
+        lesson = self.create_lesson(C_salary_high, hour=9)
+        self.student.details.usual_cost = C_salary_high
+        self.student.details.save()
+        lesson.delete()
+
+        day = DailySummary.objects.get(date=self.day)
+        self.assertEqual((day.lessons, day.high_cost_lessons), (0, 0))
+
+    def test_rebuild(self):
+        self.create_lesson(C_salary_common)
+        self.create_lesson(C_salary_high, hour=9)
+        self.create_lesson(C_salary_common, day=self.day + timedelta(days=40))
+        # the stored class is used, not the current costs
+        self.student.details.usual_cost = C_salary_high
+        self.student.details.save()
+        expected = list(DailySummary.objects.values_list(
+            'date', 'lessons', 'revenue', 'occupied_hours',
+            'high_cost_lessons'))
+        expected_months = list(MonthlySummary.objects.values_list(
+            'month', 'lessons', 'revenue'))
+        DailySummary.objects.all().delete()
+        MonthlySummary.objects.update(revenue=0)
+
+        call_command('rebuild_summaries', stdout=StringIO())
+
+        self.assertEqual(list(DailySummary.objects.values_list(
+            'date', 'lessons', 'revenue', 'occupied_hours',
+            'high_cost_lessons')), expected)
+        self.assertEqual(list(MonthlySummary.objects.values_list(
+            'month', 'lessons', 'revenue')), expected_months)
+
+
+class TestReports(TestCase):
+    """ Testing reports in the admin panel and API """
+
+    admin_credentials = {
+        'username': 'admin',
+        'password': 'admin'
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        User.objects.create_user(**cls.admin_credentials, is_staff=True,
+                                 is_superuser=True)
+        student = User.objects.create_user(username='student')
+        UserDetail.objects.create(user=student)
+        Lesson.objects.create(student=student, date=date.today(),
+                              time=time(hour=15), salary=C_salary_common)
+
+    def setUp(self):
+        self.client.login(**self.admin_credentials)
+
+    def test_reports_page(self):
+        response = self.client.get('/admin-panel/reports')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['days'][0].revenue, C_salary_common)
+
+    def test_reports_api(self):
+        response = self.client.get('/api/admin/admin-panel/reports',
+                                   {'period': 'month'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()[0]['month'],
+                         date.today().replace(day=1).isoformat())
+
+        response = self.client.get('/api/admin/admin-panel/reports',
+                                   {'start': 'wrong'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_reports_for_anonymous(self):
+        self.client.logout()
+        response = self.client.get('/api/admin/admin-panel/reports')
+        self.assertEqual(response.status_code, 403)
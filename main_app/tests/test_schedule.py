@@ -0,0 +1,56 @@
+from datetime import date, time, timedelta
+
+from django.test.testcases import TestCase
+from django.contrib.auth.models import AnonymousUser, User
+
+from main_app.models import Lesson, UserDetail, TimeBlock
+from main_app.services import build_schedule
+
+
+class TestSchedule(TestCase):
+    """ Testing rows of the schedule on the main page """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.day = date.today() + timedelta(days=1)
+        cls.student = User.objects.create_user(username='student',
+                                               first_name='Student')
+        UserDetail.objects.create(user=cls.student, telegram='@student')
+        cls.admin = User.objects.create_user(username='admin',
+                                             is_staff=True)
+        Lesson.objects.create(student=cls.student, date=cls.day,
+                              time=time(hour=15), salary=1000)
+        TimeBlock.objects.create(date=cls.day, start_time=time(hour=15),
+                                 end_time=time(hour=23))
+        TimeBlock.objects.create(date=cls.day, start_time=time(hour=8),
+                                 end_time=time(hour=9, minute=30))
+
+    def build(self, user):
+        return build_schedule(
+            [self.day], Lesson.objects.select_related('student__details'),
+            TimeBlock.objects.all(), user
+        )[self.day]
+
+    def test_rows(self):
+        rows = self.build(AnonymousUser())
+        self.assertEqual([(row.kind, row.hour) for row in rows], [
+            ('block', '8:00-9:30'), ('block', '15:00-24:00'),
+            ('lesson', '15:00'),
+        ])
+        self.assertIsNone(rows[2].lesson)
+        self.assertEqual(rows[2].label, '')
+
+    def test_own_lesson(self):
+        self.assertEqual(self.build(self.student)[2].kind, 'own')
+
+    def test_admin_rows(self):
+        row = self.build(self.admin)[2]
+        self.assertEqual((row.label, row.contact), ('Student', 'student'))
+        self.assertEqual(row.lesson.pk, row.pk)
+
+    def test_main_page(self):
+        self.client.force_login(self.admin)
+        response = self.client.get('/')
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, '15:00-24:00')
+        self.assertContains(response, 'https://t.me/student')
@@ -0,0 +1,136 @@
+from datetime import date, time, timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import RequestFactory, SimpleTestCase, TestCase
+from django.utils import timezone, translation
+
+from main_app import services
+from main_app.models import Lesson, TimeBlock
+from main_app.services import (
+    delete_rows, find_conflict, get_booking_window, get_conflict_message,
+    get_cost_messages, get_weekdays
+)
+from spacepython.constraints import C_datedelta
+
+
+class TestDailyMemoization(SimpleTestCase):
+    """ Testing memoization of date choices and cost messages """
+
+    def setUp(self):
+        get_weekdays.cache_clear()
+        get_cost_messages.cache_clear()
+
+    def test_translated_once(self):
+        with mock.patch.object(services, '_', wraps=services._) as gettext:
+            first = get_weekdays()
+            calls = gettext.call_count
+            self.assertEqual(get_weekdays(), first)
+            self.assertEqual(gettext.call_count, calls)
+        self.assertEqual(len(first), C_datedelta.days + 1)
+        self.assertEqual(first[0][0], date.today())
+
+    def test_language(self):
+        with translation.override('ru'):
+            russian = get_cost_messages(1000, 1500)
+        with translation.override('en'):
+            english = get_cost_messages(1000, 1500)
+        self.assertIn('Стоимость', russian[0])
+        self.assertIn('The cost', english[0])
+        self.assertIn('1500', english[1])
+
+    def test_costs(self):
+        self.assertIn('1000', get_cost_messages(1000, 1500)[0])
+        self.assertIn('2000', get_cost_messages(2000, 2500)[0])
+
+    def test_midnight(self):
+        tomorrow = date.today() + timedelta(days=1)
+        get_weekdays()
+        with mock.patch.object(services.timezone, 'localdate',
+                               return_value=tomorrow):
+            self.assertEqual(get_weekdays()[0][0], tomorrow)
+
+    def test_copies(self):
+        get_weekdays().clear()
+        get_cost_messages(1000, 1500).append('changed')
+        self.assertEqual(len(get_weekdays()), C_datedelta.days + 1)
+        self.assertEqual(len(get_cost_messages(1000, 1500)), 4)
+
+
+class TestBookingWindow(TestCase):
+    """ Testing the booking window of requests """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.today = timezone.localdate()
+        TimeBlock.objects.create(date=cls.today, start_time=time(8),
+                                 end_time=time(9))
+
+    def test_once_per_request(self):
+        request = RequestFactory().get('/')
+        window = get_booking_window(request)
+        self.assertEqual(window, (self.today, self.today + C_datedelta))
+        self.assertEqual(len(window.days), C_datedelta.days + 1)
+        with mock.patch.object(services.timezone, 'localdate',
+                               return_value=self.today + timedelta(days=1)):
+            self.assertEqual(get_booking_window(request), window)
+            self.assertNotEqual(get_booking_window(), window)
+
+    def test_rollover(self):
+        response = self.client.get('/api/get-timeblocks')
+        self.assertEqual(len(response.json()), 1)
+        with mock.patch.object(services.timezone, 'localdate',
+                               return_value=self.today + timedelta(days=1)):
+            response = self.client.get('/api/get-timeblocks')
+        self.assertEqual(response.json(), [])
+
+
+class TestFindConflict(TestCase):
+    """ Testing the check of a new lesson against lessons and blocks """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.day = timezone.localdate() + timedelta(days=1)
+        student = User.objects.create_user(username='student')
+        Lesson.objects.create(student=student, date=cls.day, time=time(10),
+                              salary=1000)
+        TimeBlock.objects.create(date=cls.day, start_time=time(10),
+                                 end_time=time(12))
+        TimeBlock.objects.create(date=cls.day, start_time=time(20),
+                                 end_time=time(23))
+
+    def test_one_query(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(find_conflict(self.day, time(10)),
+                             ('lesson', time(10)))
+        with self.assertNumQueries(1):
+            self.assertIsNone(find_conflict(self.day, time(15)))
+
+    def test_reasons(self):
+        self.assertEqual(find_conflict(self.day, time(10, 30)),
+                         ('lesson', time(10)))
+        self.assertEqual(find_conflict(self.day, time(11)),
+                         ('block', time(10)))
+        self.assertIsNone(find_conflict(self.day, time(9, 59)))
+        self.assertIsNone(find_conflict(self.day, time(12)))
+        self.assertIsNone(find_conflict(self.day + timedelta(days=1),
+                                        time(11)))
+        # the block to the end of the day includes 23:00
+        self.assertEqual(find_conflict(self.day, time(23)),
+                         ('block', time(20)))
+
+    def test_delete_rows(self):
+        blocks = list(TimeBlock.objects.values_list('pk', flat=True))
+        with self.assertNumQueries(1):
+            self.assertEqual(delete_rows(TimeBlock, blocks + [0]), 2)
+        self.assertEqual(delete_rows(TimeBlock, []), 0)
+        self.assertFalse(TimeBlock.objects.exists())
+
+    @translation.override('en')
+    def test_messages(self):
+        self.assertEqual(
+            get_conflict_message(('lesson', time(10))),
+            'Some lesson is already scheduled for 10:00:00 that day'
+        )
+        self.assertEqual(get_conflict_message(('block', time(10))),
+                         'This time is blocked')
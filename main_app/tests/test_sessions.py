@@ -0,0 +1,82 @@
+from datetime import date, time, timedelta
+
+from django.contrib.sessions.backends.cached_db import KEY_PREFIX
+from django.core.cache import caches
+from django.db import connection
+from django.test.testcases import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth import BACKEND_SESSION_KEY
+from django.contrib.auth.models import User
+
+from main_app.backends import USER_DETAILS_BACKEND
+from main_app.models import Lesson, UserDetail
+
+
+class TestSessionQueries(TestCase):
+    """ Testing that page views of a logged-in student don't query sessions
+    and load the user with the details at once """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.day = date.today() + timedelta(days=1)
+        student = User.objects.create_user(username='student',
+                                           password='student')
+        UserDetail.objects.create(user=student, phone='79990000000',
+                                  usual_cost=1200, high_cost=1500)
+        Lesson.objects.create(student=student, date=cls.day,
+                              time=time(hour=15), salary=1000)
+
+    def setUp(self):
+        self.client.login(username='student', password='student')
+
+    def test_no_session_queries(self):
+        for page in ('/', '/my-lessons', '/add-lesson'):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(page)
+            self.assertEqual(response.status_code, 200)
+            self.assertFalse([query for query in queries
+                              if 'django_session' in query['sql']], page)
+
+    def test_user_loaded_with_details(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post('/add-lesson', {
+                'date': self.day.isoformat(), 'time': 16
+            })
+        self.assertEqual(response.status_code, 302)
+        lesson = Lesson.objects.get(date=self.day, time=time(hour=16))
+        self.assertEqual(lesson.salary, 1200)
+        self.assertFalse([query for query in queries
+                          if 'FROM "main_app_userdetail"' in query['sql']])
+
+    def test_messages_in_cookie(self):
+        self.client.logout()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post('/login', {'field': '70000000000'})
+        self.assertEqual(response.status_code, 302)
+        self.assertIn('messages', response.cookies)
+        self.assertFalse([query for query in queries
+                          if 'django_session' in query['sql']])
+
+    def test_shared_cache(self):
+        session_key = self.client.session.session_key
+        self.client.get('/')
+        self.assertIsNotNone(caches['shared'].get(KEY_PREFIX + session_key))
+        self.client.logout()
+        self.assertIsNone(caches['shared'].get(KEY_PREFIX + session_key))
+
+    def test_model_backend_session(self):
+        # sessions created before the switch to UserDetailsBackend
+        self.client.logout()
+        self.client.force_login(
+            User.objects.get(username='student'),
+            backend='django.contrib.auth.backends.ModelBackend'
+        )
+        response = self.client.get('/my-lessons')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.wsgi_request.user.username, 'student')
+
+    def test_login_backend(self):
+        self.client.logout()
+        self.client.post('/login', {'field': '79990000000'})
+        self.assertEqual(self.client.session[BACKEND_SESSION_KEY],
+                         USER_DETAILS_BACKEND)
@@ -0,0 +1,53 @@
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.test import SimpleTestCase
+
+
+STARTUP_BUDGET = 1.5  # seconds to import the wsgi application and urls
+
+
+class TestStartup(SimpleTestCase):
+    """ Testing the cold start of a production process """
+
+    def run_python(self, code, *options):
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE='spacepython.settings',
+                   SECRET_KEY='startup', URL_PREFIX='', DEBUG='False')
+        env.pop('API_BROWSABLE', None)
+        result = subprocess.run(
+            [sys.executable, *options, '-c', code], cwd=settings.BASE_DIR,
+            env=env, capture_output=True, text=True, timeout=60
+        )
+        self.assertEqual(result.returncode, 0, result.stderr[-2000:])
+        return result
+
+    def test_import_time(self):
+        result = self.run_python(
+            'import spacepython.wsgi; import spacepython.urls',
+            '-X', 'importtime'
+        )
+        total = 0
+        for line in result.stderr.splitlines():
+            # import time: self [us] | cumulative | imported package
+            _self, cumulative, module = line.split('|')
+            if module.strip() in ('spacepython.wsgi', 'spacepython.urls'):
+                total += int(cumulative)
+        self.assertLess(total / 10**6, STARTUP_BUDGET)
+
+    def test_no_requests_on_import(self):
+        # the telegram notice imports requests when it's sent
+        self.run_python(
+            "import sys; sys.modules['requests'] = None; "
+            "import spacepython.wsgi; import spacepython.urls"
+        )
+
+    def test_production_renderers(self):
+        result = self.run_python(
+            'import django; django.setup(); '
+            'from rest_framework.settings import api_settings; '
+            'print([renderer.__name__ for renderer in '
+            'api_settings.DEFAULT_RENDERER_CLASSES])'
+        )
+        self.assertEqual(result.stdout.strip(), "['JSONRenderer']")
@@ -0,0 +1,19 @@
+from django.test import SimpleTestCase, override_settings
+
+from spacepython.finders import AppDirectoriesFinder
+
+
+class TestStaticFinder(SimpleTestCase):
+    """ Testing exclusion of static files of apps """
+
+    asset = 'rest_framework/css/bootstrap.min.css'
+
+    @override_settings(STATICFILES_EXCLUDED_APPS=['rest_framework'])
+    def test_excluded_app(self):
+        finder = AppDirectoriesFinder()
+        self.assertFalse(finder.find(self.asset))
+        self.assertTrue(finder.find('admin/css/base.css'))
+
+    @override_settings(STATICFILES_EXCLUDED_APPS=[])
+    def test_included_app(self):
+        self.assertTrue(AppDirectoriesFinder().find(self.asset))
@@ -0,0 +1,78 @@
+import re
+
+from django.contrib.auth.models import User
+from django.test.testcases import TestCase
+
+from main_app.models import UserDetail
+from main_app.views import StudentsAP
+
+
+class TestStudentSearch(TestCase):
+    """ Testing pagination and search of the student list """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(username='admin', is_staff=True,
+                                             is_superuser=True)
+        UserDetail.objects.create(user=cls.admin)
+        for i in range(StudentsAP.paginate_by + 10):
+            user = User.objects.create_user(username=f'student{i}',
+                                            first_name=f'Student {i:03}')
+            UserDetail.objects.create(user=user, alias=f'alias {i:03}',
+                                      phone=f'7999000{i:04}',
+                                      telegram=f'@student{i:03}')
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def get_students(self, headers=None, **params):
+        response = self.client.get('/admin-panel/students', params,
+                                   **(headers or {}))
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_pages(self):
+        response = self.get_students()
+        self.assertEqual(len(response.context['students']),
+                         StudentsAP.paginate_by)
+        self.assertContains(response, '?page=2')
+        self.assertContains(response, 'htmx.min.js" integrity="sha384-')
+        response = self.get_students(page=2)
+        self.assertEqual(len(response.context['students']), 10)
+        self.assertEqual(
+            self.client.get('/admin-panel/students?page=9').status_code, 404
+        )
+
+    def test_boosted_elements(self):
+        """ Only the search form and the pages are swapped by htmx, links to
+        students open the pages """
+
+        content = self.get_students().content.decode()
+        boosted = re.findall(r'<(\w+)[^>]*hx-boost="true"', content)
+        self.assertEqual(set(boosted), {'form', 'nav'})
+        links = re.findall(r'<a [^>]*href="/admin-panel/students/\d+"',
+                           content)
+        self.assertTrue(links)
+        for link in links:
+            self.assertNotIn('hx-', link)
+        self.assertNotIn('hx-target="this"', content)
+
+    def test_search(self):
+        for query in ('student 007', 'ALIAS 007', '79990000007',
+                      '@student007'):
+            response = self.get_students(q=query)
+            self.assertEqual(
+                [student.username for student in response.context['students']],
+                ['student7'], query
+            )
+        response = self.get_students(q='alias 0')
+        self.assertContains(response, 'q=alias%200')
+
+    def test_partial(self):
+        response = self.get_students(headers={'HTTP_HX_REQUEST': 'true'},
+                                     q='nobody')
+        self.assertTemplateUsed(
+            response, 'main_app/management/inc/_students_table.html'
+        )
+        self.assertTemplateNotUsed(response, 'base.html')
+        self.assertEqual(len(response.context['students']), 0)
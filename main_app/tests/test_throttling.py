@@ -0,0 +1,81 @@
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+
+from main_app.throttling import hit
+
+
+@override_settings(THROTTLE_RATES={'login': '2/m', 'registration': '2/h'})
+class TestThrottling(TestCase):
+    """ Testing sliding window throttling of login and registration """
+
+    def setUp(self):
+        caches['shared'].clear()
+
+    def test_sliding_window(self):
+        # 2 requests at the end of the previous minute
+        self.assertEqual(hit('key', '2/m', now=119), 0)
+        self.assertEqual(hit('key', '2/m', now=119), 0)
+        # the previous window is counted with weight 0.5
+        self.assertEqual(hit('key', '2/m', now=150), 0)
+        self.assertEqual(hit('key', '2/m', now=150), 31)
+        # rejected requests are counted too
+        self.assertEqual(hit('key', '2/m', now=239), 0)
+
+    def test_api_by_ip(self):
+        for phone in ('79990000001', '79990000002'):
+            response = self.client.post('/api/get-token', {'phone': phone})
+            self.assertEqual(response.status_code, 404)
+        with self.assertNumQueries(0):
+            response = self.client.post('/api/get-jwt',
+                                        {'phone': '79990000003'})
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
+
+    def test_spoofed_forwarded_for(self):
+        for i in range(3):
+            response = self.client.post(
+                '/api/get-token', {'phone': f'7999000000{i}'},
+                HTTP_X_FORWARDED_FOR=f'10.0.0.{i}'
+            )
+        self.assertEqual(response.status_code, 429)
+
+    @override_settings(REST_FRAMEWORK={'NUM_PROXIES': 1})
+    def test_behind_proxy(self):
+        # the client can prepend anything, the proxy appends the real IP
+        for i in range(3):
+            response = self.client.post(
+                '/api/get-token', {'phone': f'7999000000{i}'},
+                HTTP_X_FORWARDED_FOR=f'10.0.0.{i}, 192.168.0.1'
+            )
+        self.assertEqual(response.status_code, 429)
+        response = self.client.post(
+            '/api/get-token', {'phone': '79990000009'},
+            HTTP_X_FORWARDED_FOR='192.168.0.2'
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_api_by_identifier(self):
+        for ip in ('10.0.0.1', '10.0.0.2', '10.0.0.3'):
+            response = self.client.post('/api/get-token',
+                                        {'telegram': '@nickname'},
+                                        REMOTE_ADDR=ip)
+        self.assertEqual(response.status_code, 429)
+
+    def test_login_page(self):
+        for _i in range(2):
+            self.client.post('/login', {'field': '79990000001'})
+        with self.assertNumQueries(0):
+            response = self.client.post('/login', {'field': '79990000001'})
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(self.client.get('/login').status_code, 200)
+
+    def test_registration(self):
+        for phone in ('79990000001', '79990000002', '79990000003'):
+            response = self.client.post('/register', {
+                'first_name': 'Student', 'phone': phone, 'telegram': ''
+            })
+        self.assertEqual(response.status_code, 429)
+        response = self.client.post('/api/registration', {
+            'first_name': 'Student', 'phone': '79990000004', 'telegram': ''
+        })
+        self.assertEqual(response.status_code, 429)
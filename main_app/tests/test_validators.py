@@ -0,0 +1,89 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, time, timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework.exceptions import ValidationError
+
+from main_app.models import Lesson
+from main_app.serializers import LessonAdminSerializer
+
+
+def validate(validator, student, day, hour):
+    """ True if the lesson is valid """
+
+    try:
+        validator({'student': student, 'date': day, 'time': time(hour)})
+    except ValidationError:
+        return False
+    return True
+
+
+class TestStatelessValidators(TestCase):
+    """ Testing that the shared validator of the serializer doesn't change """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = User.objects.create_user(username='student')
+        cls.days = [date.today() + timedelta(days=i) for i in (1, 2)]
+        Lesson.objects.create(student=cls.student, date=cls.days[0],
+                              time=time(10), salary=1000)
+        Lesson.objects.create(student=cls.student, date=cls.days[1],
+                              time=time(12), salary=1000)
+
+    def test_constant_sql(self):
+        validator = LessonAdminSerializer.Meta.validators[0]
+        base_query = str(validator.queryset.query)
+        with CaptureQueriesContext(connection) as first:
+            validate(validator, self.student, self.days[0], 15)
+        for i in range(10000):
+            day = self.days[i % 2]
+            self.assertTrue(validate(validator, self.student, day, 15))
+        with CaptureQueriesContext(connection) as last:
+            validate(validator, self.student, self.days[0], 15)
+
+        self.assertEqual(str(validator.queryset.query), base_query)
+        self.assertEqual([query['sql'] for query in last.captured_queries],
+                         [query['sql'] for query in first.captured_queries])
+        # the busy times of the day only
+        self.assertNotIn('"student_id"', first.captured_queries[0]['sql'])
+        self.assertIsNone(validator.queryset._result_cache)
+
+    def test_other_dates(self):
+        validator = LessonAdminSerializer.Meta.validators[0]
+        self.assertFalse(validate(validator, self.student, self.days[0], 10))
+        self.assertFalse(validate(validator, self.student, self.days[1], 12))
+        self.assertTrue(validate(validator, self.student, self.days[0], 12))
+
+
+class TestThreadedValidators(TransactionTestCase):
+    """ Testing the shared validator from many threads """
+
+    def test_threads(self):
+        student = User.objects.create_user(username='student')
+        days = [date.today() + timedelta(days=i) for i in (1, 2, 3, 4)]
+        for hour, day in enumerate(days, start=9):
+            Lesson.objects.create(student=student, date=day,
+                                  time=time(hour), salary=1000)
+        validator = LessonAdminSerializer.Meta.validators[0]
+        base_query = str(validator.queryset.query)
+
+        def check(index):
+            try:
+                day = days[index % len(days)]
+                busy = 9 + index % len(days)
+                return [(validate(validator, student, day, busy),
+                         validate(validator, student, day, busy + 5))
+                        for _i in range(50)]
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(check, range(16)))
+
+        for result in results:
+            self.assertEqual(set(result), {(False, True)})
+        self.assertEqual(str(validator.queryset.query), base_query)
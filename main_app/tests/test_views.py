@@ -4,6 +4,7 @@ from django.test.testcases import TestCase
 from django.test.client import Client
 from django.contrib.auth.models import User
 
+from main_app.backends import USER_DETAILS_BACKEND
 from main_app.models import Lesson, UserDetail, TimeBlock
 from spacepython.constraints import C_salary_common
 
@@ -126,9 +127,7 @@ class TestUserAbilities(TestCase):
         phone = self.user_credentials['phone']
         telegram = self.user_credentials['telegram']
         user = UserDetail.objects.get(phone=phone, telegram=telegram).user
-        self.client._login(
-            user
-        )
+        self.client._login(user, backend=USER_DETAILS_BACKEND)
 
     def test_login(self):
         response = Client().post(
@@ -233,6 +232,19 @@ class TestAdminAbilities(TestCase):
         self.assertRedirects(response, '/')
         self.assertTrue(Lesson.objects.filter(student=student))
 
+    def test_lesson_cost(self):
+        student = User.objects.get(username=self.other_user_creds['username'])
+        UserDetail.objects.filter(user=student).update(usual_cost=1200,
+                                                       high_cost=1500)
+        day = date.today() + timedelta(days=2)
+        for hour in (9, 15):
+            self.client.post('/admin-panel/add-lesson', {
+                'student': student.id, 'time': hour, 'date': day
+            })
+        self.assertEqual(list(Lesson.objects.filter(
+            student=student
+        ).values_list('salary', flat=True)), [1500, 1200])
+
     def test_timeblock_creation(self):
         timeBlock_amount_before = len(TimeBlock.objects.all())
         form_data = {
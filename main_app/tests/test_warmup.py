@@ -0,0 +1,24 @@
+import time
+
+from django.db import connection
+from django.template import engines
+from django.test import TestCase
+
+from spacepython.warmup import warmup_connections, warmup_templates
+
+
+class TestWarmup(TestCase):
+    """ Testing the warmup of server processes (see gunicorn.conf.py) """
+
+    def test_templates(self):
+        self.assertGreater(warmup_templates(), 0)
+        loader = engines['django'].engine.template_loaders[0]
+        self.assertIn('main_app/add_lesson.html',
+                      loader.get_template_cache)
+
+    def test_connections(self):
+        warmup_connections()
+        self.assertIsNotNone(connection.connection)
+        # the connection outlives the start of a request
+        self.assertGreater(connection.settings_dict['CONN_MAX_AGE'], 0)
+        self.assertGreater(connection.close_at, time.monotonic())
@@ -0,0 +1,115 @@
+""" Sliding window throttling of the login and registration endpoints.
+
+Requests are counted per client IP and per identifier (phone or telegram)
+in the shared cache: the counter of the current fixed window plus
+the counter of the previous one weighted by its part still inside
+the sliding window. The check runs before authentication and any other
+database work, so a throttled request costs only cache operations.
+
+Rates are set by THROTTLE_RATES in settings.py ('<amount>/<s|m|h|d>'). """
+
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.utils.translation import gettext as _
+
+from rest_framework.exceptions import Throttled
+from rest_framework.throttling import BaseThrottle
+
+
+PERIODS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 60 * 60 * 24}
+IDENTIFIER_FIELDS = ('phone', 'telegram', 'field')
+
+
+def parse_rate(rate):
+    """ '10/min' -> (10, 60) """
+
+    amount, period = rate.split('/')
+    return int(amount), PERIODS[period.strip()[0]]
+
+
+def hit(key, rate, now=None):
+    """ Counts the request, returns seconds to wait (0 - allowed) """
+
+    limit, window = parse_rate(rate)
+    cache = caches[settings.THROTTLE_CACHE]
+    now = now or time.time()
+    index = int(now // window)
+    current_key = f'throttle:{key}:{index}'
+    cache.add(current_key, 0, window * 2)
+    try:
+        current = cache.incr(current_key)
+    except ValueError:  # expired between add() and incr()
+        cache.set(current_key, 1, window * 2)
+        current = 1
+    previous = cache.get(f'throttle:{key}:{index - 1}', 0)
+    elapsed = now - index * window
+    if previous * (1 - elapsed / window) + current <= limit:
+        return 0
+    return int(window - elapsed) + 1
+
+
+def get_identifiers(data):
+    """ Hashes of the phone / telegram (safe for cache keys) """
+
+    return [
+        hashlib.md5(data[field].strip().lower().encode()).hexdigest()
+        for field in IDENTIFIER_FIELDS
+        if isinstance(data.get(field), str) and data[field].strip()
+    ]
+
+
+def check_request(request, scope, data):
+    """ Seconds to wait for the client IP and identifiers in the data """
+
+    rate = settings.THROTTLE_RATES[scope]
+    keys = [f'{scope}:ip:{BaseThrottle().get_ident(request)}']
+    keys.extend(f'{scope}:id:{ident}' for ident in get_identifiers(data))
+    return max(hit(key, rate) for key in keys)
+
+
+class SlidingWindowThrottle(BaseThrottle):
+    """ DRF throttle, the view sets throttle_scope and must have
+    authentication_classes = [] to skip the database """
+
+    def allow_request(self, request, view):
+        if request.method != 'POST':
+            return True
+        self.wait_seconds = check_request(request, view.throttle_scope,
+                                          request.data)
+        return not self.wait_seconds
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class ThrottleMixin:
+    """ Throttling of POST requests of html views by throttle_scope. The check
+    wraps the whole view, because dispatch() of views reads request.user """
+
+    throttle_scope = None
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+
+        @wraps(view)
+        def throttled_view(request, *args, **kwargs):
+            if request.method == 'POST':
+                wait = check_request(request, cls.throttle_scope,
+                                     request.POST)
+                if wait:
+                    response = HttpResponse(
+                        _("Too many attempts, please try again in {} "
+                          "seconds").format(wait),
+                        status=Throttled.status_code
+                    )
+                    response['Retry-After'] = str(wait)
+                    return response
+            return view(request, *args, **kwargs)
+
+        return throttled_view
@@ -4,12 +4,16 @@ from rest_framework.routers import DefaultRouter
 from .views import (
     CustomRegistrationView, CustomLogOutView, CustomLoginView, AddLessonView,
     DeleteLessonView, LessonView, LessonByUserView,
-    InfoView,
+    InfoView, CalendarFeedView,
     SettingsAP, AddLessonAP, TimeBlockerAP, StudentsAP, StudentDetailAP,
-    UsersAPI, RegistrationAPI, GetTokenAPI, RelevantLessonsAPI, LessonsViewSet,
-    LessonsAdminViewSet, RelevantLessonsAdminViewSet, DeleteUserAPI,
+    ReportsAP, ImportAP,
+    UsersAPI, RegistrationAPI, GetTokenAPI, GetJWTAPI, RefreshJWTAPI,
+    RelevantLessonsAPI,
+    LessonsViewSet, LessonsAdminViewSet, RelevantLessonsAdminViewSet,
+    DeleteUserAPI,
     TimeBlockAPI, TimeBlockAdminAPI, StudentAdminAPI,
-    NoticeByUserAPI
+    NoticeByUserAPI, ReportsAdminAPI, LessonsExportAPI,
+    StudentAutocompleteAPI
 )
 
 router = DefaultRouter()
@@ -36,6 +40,8 @@ urlpatterns = [
     path('delete-lesson/<int:pk>/', DeleteLessonView.as_view(),
          name='del_lesson_url'),
     path('info', InfoView.as_view(), name='info_url'),
+    path('calendar/<str:token>.ics', CalendarFeedView.as_view(),
+         name='calendar_feed_url'),
 
     # Admin panel
     path('admin-panel/settings', SettingsAP.as_view(),
@@ -48,16 +54,27 @@ urlpatterns = [
          name='students_AP_url'),
     path('admin-panel/students/<int:pk>', StudentDetailAP.as_view(),
          name='student_detail_AP_url'),
+    path('admin-panel/reports', ReportsAP.as_view(),
+         name='reports_AP_url'),
+    path('admin-panel/import', ImportAP.as_view(),
+         name='import_AP_url'),
 
     # API
     path('api/registration', RegistrationAPI.as_view()),
     path('api/get-token', GetTokenAPI.as_view()),
+    path('api/get-jwt', GetJWTAPI.as_view()),
+    path('api/refresh-jwt', RefreshJWTAPI.as_view()),
     path('api/get-users', UsersAPI.as_view()),
     path('api/get-relevant-lessons', RelevantLessonsAPI.as_view()),
     path('api/delete-user/<int:pk>/', DeleteUserAPI.as_view()),
+    path('api/export/lessons.<str:export_format>',
+         LessonsExportAPI.as_view()),
 
     # Admin panel API
     path('api/get-timeblocks', TimeBlockAPI.as_view()),
+    path('api/admin/admin-panel/reports', ReportsAdminAPI.as_view()),
+    path('api/admin/admin-panel/autocomplete/students',
+         StudentAutocompleteAPI.as_view(), name='student_autocomplete_url'),
 ]
 
 urlpatterns += router.urls
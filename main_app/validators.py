@@ -8,7 +8,8 @@ from rest_framework.utils.representation import smart_repr
 from spacepython.constraints import (
     С_morning_time, C_evening_time, C_timedelta, C_datedelta,
 )
-from .models import TimeBlock, Lesson
+from .models import Lesson
+from .services import find_conflict, get_conflict_message
 
 
 class RegistrationValidator():
@@ -49,51 +50,51 @@ class RegistrationValidator():
         return 'RegistrationValidator class without queryset'
 
 
-class AdminValidator():
-    """ Сheck for non-intersection of lessons """
+class QuerysetValidator():
+    """ Base of validators by a queryset. Validators are created once in
+    Meta of serializers and shared between requests (and threads), so
+    __call__ mustn't change the instance: every call builds its own
+    queries from the base queryset, which is never evaluated """
 
     def __init__(self, queryset):
         self.queryset = queryset
 
+    def get_queryset(self):
+        return self.queryset.all()
+
+    def __repr__(self):
+        return '<%s(queryset=%s)>' % (
+            self.__class__.__name__,
+            smart_repr(self.queryset)
+        )
+
+
+def check_conflict(queryset, date, time):
+    """ Сheck for non-intersection with lessons of the queryset and
+    time blocks """
+
+    conflict = find_conflict(date, time, lessons=queryset)
+    if conflict:
+        raise ValidationError(get_conflict_message(conflict))
+
+
+class AdminValidator(QuerysetValidator):
+    """ Сheck for non-intersection of lessons """
+
     def __call__(self, attrs):
         student = attrs['student']
         time = attrs['time']
         date = attrs['date']
 
-        # free time check
-        self.queryset = self.queryset.filter(date=date).values_list('time')
-        times = [item[0] for item in self.queryset]
-        for t1 in times:
-            t2 = datetime.time(t1.hour+1, t1.minute, t1.second)
-            if t1 <= time < t2:
-                raise ValidationError(_(
-                    "Some lesson is already scheduled for {} that day"
-                ).format(t1))
-
         if student == '':
             raise ValidationError(_("Please, select a student"))
 
-        # check blocked time overlap
-        blocked_times = TimeBlock.objects.filter(date=date).values(
-            'start_time', 'end_time')
-        for blocked_time in blocked_times:
-            if (blocked_time['start_time'] <= time < blocked_time['end_time']
-                    or time == blocked_time['end_time'] == datetime.time(23)):
-                raise ValidationError(_("This time is blocked"))
-
-    def __repr__(self):
-        return '<%s(queryset=%s)>' % (
-            self.__class__.__name__,
-            smart_repr(self.queryset)
-        )
+        check_conflict(self.get_queryset(), date, time)
 
 
-class UserValidator():
+class UserValidator(QuerysetValidator):
     """ Validation of creation (update) of new lesson by student """
 
-    def __init__(self, queryset):
-        self.queryset = queryset
-
     def __call__(self, attrs):
         time = attrs['time']
         date = attrs['date']
@@ -122,38 +123,12 @@ class UserValidator():
         elif time > C_evening_time:
             raise ValidationError(_("The time {} is too late").format(time))
 
-        # free time check
-        self.queryset = self.queryset.filter(date=date).values_list('time')
-        times = [item[0] for item in self.queryset]
-        for t1 in times:
-            t2 = datetime.time(t1.hour+1, t1.minute, t1.second)
-            if t1 <= time < t2:
-                raise ValidationError(
-                    _("Some lesson is already scheduled for "
-                      "{} that day").format(t1)
-                )
+        check_conflict(self.get_queryset(), date, time)
 
-        # check blocked time overlap
-        blocked_times = TimeBlock.objects.filter(date=date).values(
-            'start_time', 'end_time')
-        for blocked_time in blocked_times:
-            if (blocked_time['start_time'] <= time < blocked_time['end_time']
-                    or time == blocked_time['end_time'] == datetime.time(23)):
-                raise ValidationError(_("This time is blocked"))
 
-    def __repr__(self):
-        return '<%s(queryset=%s)>' % (
-            self.__class__.__name__,
-            smart_repr(self.queryset)
-        )
-
-
-class TimeBlockValidator():
+class TimeBlockValidator(QuerysetValidator):
     """ Validator of Timeblock """
 
-    def __init__(self, queryset):
-        self.queryset = queryset
-
     def __call__(self, attrs):
         date = attrs['date']
         start_time = attrs['start_time']
@@ -170,7 +145,7 @@ class TimeBlockValidator():
             )
 
         # checking if block overlap
-        blocked_times = self.queryset.filter(date=date).values(
+        blocked_times = self.get_queryset().filter(date=date).values(
             'start_time', 'end_time')
         for blocked_time in blocked_times:
             condition_1 = (blocked_time['start_time'] <= start_time
@@ -204,9 +179,3 @@ class TimeBlockValidator():
                 raise ValidationError(
                     _("Your block overlaps an existing lesson")
                 )
-
-    def __repr__(self):
-        return '<%s(queryset=%s)>' % (
-            self.__class__.__name__,
-            smart_repr(self.queryset)
-        )
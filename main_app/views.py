@@ -1,10 +1,13 @@
 from copy import deepcopy
+import csv
 from datetime import date, timedelta, datetime
 import json
-import requests
 
+from django.db.models import Q
 from django.urls import reverse_lazy
-from django.http import HttpResponseRedirect
+from django.http import (
+    HttpResponse, HttpResponseRedirect, StreamingHttpResponse, Http404
+)
 from django.shortcuts import render, redirect
 from django.utils.translation import gettext as _
 from django.views.generic import (
@@ -17,6 +20,7 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.auth.views import LogoutView
 
 from rest_framework import viewsets, status, mixins
+from rest_framework.decorators import action
 from rest_framework.views import APIView
 from rest_framework.generics import GenericAPIView
 from rest_framework.generics import (
@@ -24,18 +28,26 @@ from rest_framework.generics import (
 )
 from rest_framework.permissions import IsAdminUser, IsAuthenticated, AllowAny
 from rest_framework.response import Response
+from rest_framework.exceptions import ValidationError
 from rest_framework.authtoken.models import Token
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.views import TokenRefreshView
 
-from .models import Lesson, UserDetail, TimeBlock, User
+from .models import (
+    Lesson, UserDetail, TimeBlock, User, DailySummary, MonthlySummary
+)
 from .forms import (
     RegisterUserForm, AuthUserForm, AddLessonForm, AddLessonAdminForm,
-    TimeBlockerAPForm, StudentUpdateForm
+    TimeBlockerAPForm, StudentUpdateForm, ImportAPForm
 )
 from .serializers import (
     UserSerializer, TokenRequestSerializer, ReceivingTokenSerializer,
     LessonSerializer, LessonAdminSerializer, RegistrationSerializer,
     DelUserSerializer, TimeBlockSerializer, TimeBlockAdminSerializer,
-    StudentAdminSerializer, NotificationSerializer
+    StudentAdminSerializer, NotificationSerializer, DailySummarySerializer,
+    MonthlySummarySerializer, ReceivingJWTSerializer, RefreshJWTSerializer,
+    LessonsCancelSerializer, LessonsShiftSerializer, LessonsReassignSerializer,
+    TimeBlocksDeleteSerializer, LessonsRepriceSerializer
 )
 from spacepython.constraints import (
     С_morning_time, С_morning_time_markup, C_evening_time_markup,
@@ -43,7 +55,23 @@ from spacepython.constraints import (
     C_timedelta, C_datedelta
 )
 from spacepython.settings import env, CHANGED_DATES
-from .services import get_weekdays
+from .services import (
+    get_weekdays, get_cost_messages, get_schedule_version, get_user_details,
+    calculate_salary, build_schedule, get_booking_window, BookingWindow
+)
+from .exports import EXPORT_FORMATS, get_export_queryset
+from .imports import import_students, import_lessons, read_csv
+from .archive import lesson_history
+from .bulk import (
+    cancel_lessons, delete_blocks, shift_lessons, reassign_lessons,
+    reprice_lessons
+)
+from .backends import USER_DETAILS_BACKEND
+from .autocomplete import AUTOCOMPLETE_LIMIT, search_students
+from .throttling import SlidingWindowThrottle, ThrottleMixin
+from .calendar_feeds import (
+    get_feed, get_feed_etag, get_feed_token, read_feed_token
+)
 
 
 class LessonView(ListView):
@@ -54,50 +82,34 @@ class LessonView(ListView):
     context_object_name = 'lessons'
 
     def get_queryset(self):
-        today = date.today()
+        window = get_booking_window(self.request)
+        today, last_day = window
         if CHANGED_DATES:
             today = date(2026, 1, 1)
+            last_day = today + C_datedelta
         lessons = self.model.objects.filter(
-            date__gte=today
-        ).select_related(
-            'student',
-            'student__details'
+            date__gte=today,
+            date__lte=last_day
         )
-        lessons = list(lessons)
+        if self.request.user.is_staff:
+            lessons = lessons.select_related('student', 'student__details')
+        else:
+            lessons = lessons.only('date', 'time', 'student_id')
         blocked_times = TimeBlock.objects.filter(
             date__gte=today,
-            date__lte=today + C_datedelta
-        )
-        blocked_times = list(blocked_times)
-        query = {today + timedelta(days=i): [] for i in range(
-            C_datedelta.days+1
-        )}
-        for _ in range(len(lessons) + len(blocked_times)):
-            if lessons and blocked_times:
-                condition_1 = lessons[0].date < blocked_times[0].date
-                condition_2 = (
-                    lessons[0].date == blocked_times[0].date and
-                    lessons[0].time < blocked_times[0].start_time
-                )
-                if condition_1 or condition_2:
-                    day = lessons[0].date
-                    query[day].append(lessons.pop(0))
-                else:
-                    day = blocked_times[0].date
-                    query[day].append(blocked_times.pop(0))
-            else:
-                exists = lessons or blocked_times
-                day = exists[0].date
-                query[day].append(exists.pop(0))
+            date__lte=last_day
+        ).only('date', 'start_time', 'end_time')
+        days = BookingWindow(today, last_day).days
+        query = build_schedule(days, lessons, blocked_times,
+                               self.request.user)
         if CHANGED_DATES:
-            changed_query = self.key_substitution(query)
+            changed_query = self.key_substitution(query, window.start)
             return changed_query
         else:
             return query
     
-    def key_substitution(self, query: dict) -> dict:
+    def key_substitution(self, query: dict, today: date) -> dict:
         """ Меняем даты в ключах заглушки (смещаяем с 2026-01-01 на сегодня) """
-        today = date.today()
         output_query = {}
         i = 0
         for key, value in query.items():
@@ -121,19 +133,25 @@ class LessonByUserView(LoginRequiredMixin, ListView):
 
     def get_queryset(self):
         lessons = self.model.objects.filter(
-            date__gte=date.today(),
+            date__gte=get_booking_window(self.request).start,
             student_id=self.request.user.id
         )
         return lessons
 
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['calendar_url'] = get_calendar_url(self.request)
+        return context
+
 
-class CustomLoginView(TemplateView, FormMixin):
+class CustomLoginView(ThrottleMixin, TemplateView, FormMixin):
     """Authentication"""
 
     model = User
     template_name = "main_app/login.html"
     form_class = AuthUserForm
     success_url = reverse_lazy('home_url')
+    throttle_scope = 'login'
 
     def get_success_url(self):
         return self.success_url
@@ -164,7 +182,7 @@ class CustomLoginView(TemplateView, FormMixin):
         user = self.get_user(input_field)
 
         if user:
-            login(self.request, user)
+            login(self.request, user, backend=USER_DETAILS_BACKEND)
             return HttpResponseRedirect(self.get_success_url())
         else:
             messages.error(
@@ -195,12 +213,13 @@ class CustomLoginView(TemplateView, FormMixin):
         return user
 
 
-class CustomRegistrationView(CreateView):
+class CustomRegistrationView(ThrottleMixin, CreateView):
     """Registration"""
 
     model = User
     template_name = 'main_app/registration.html'
     success_url = reverse_lazy('home_url')
+    throttle_scope = 'registration'
 
     def dispatch(self, request, *args, **kwargs):
         if request.user.is_authenticated:
@@ -235,7 +254,7 @@ class CustomRegistrationView(CreateView):
             _("Registration completed")
         )
 
-        login(self.request, user)
+        login(self.request, user, backend=USER_DETAILS_BACKEND)
         return redirect('home_url')
 
     def create_user(self, first_name, phone, telegram):
@@ -302,8 +321,7 @@ class AddLessonView(LoginRequiredMixin, CreateView):
 
     def get_context_data(self, request, **kwargs):
         context = {}
-        # value existence check can be disabled in the future
-        user_detail = UserDetail.objects.get(user_id=request.user.id)
+        user_detail = get_user_details(request)
         if user_detail.usual_cost and user_detail.high_cost:
             usual_cost = user_detail.usual_cost
             high_cost = user_detail.high_cost
@@ -311,25 +329,7 @@ class AddLessonView(LoginRequiredMixin, CreateView):
             usual_cost = C_salary_common
             high_cost = C_salary_high
 
-        cost_messages = []
-        cost_messages.append(_(
-                "The cost of a usual lesson is {} ₽"
-            ).format(usual_cost)
-        )
-        cost_messages.append(_(
-                "The cost of a lesson in the early morning to {} is {} ₽."
-            ).format(С_morning_time_markup.strftime(r'%H:%M'), high_cost)
-        )
-        cost_messages.append(_(
-                "The cost of a lesson in the late evening to {} is {} ₽."
-            ).format(C_evening_time_markup.strftime(r'%H:%M'), high_cost)
-        )
-        cost_messages.append(_(
-                "The cost of a lesson when day is full ({} lessons per day) "
-                "is {} ₽."
-            ).format(C_lesson_threshold - 1, high_cost)
-        )
-        context['cost_messages'] = cost_messages
+        context['cost_messages'] = get_cost_messages(usual_cost, high_cost)
 
         context['C_timedelta'] = C_timedelta.seconds // 3600
 
@@ -363,26 +363,14 @@ class AddLessonView(LoginRequiredMixin, CreateView):
         lesson.date = date
         lesson.student_id = request.user.pk
 
-        is_morning = С_morning_time <= time < С_morning_time_markup
-        is_evening = C_evening_time_markup < time <= C_evening_time
-        is_over = len(Lesson.objects.filter(date=date)
-                      ) >= C_lesson_threshold - 1
-        # value existence check can be disabled in the future
-        user_detail = UserDetail.objects.get(user_id=request.user.id)
-        if is_morning or is_evening or is_over:
-            if user_detail.high_cost:
-                lesson.salary = user_detail.high_cost
-            else:
-                lesson.salary = C_salary_high
-        else:
-            if user_detail.usual_cost:
-                lesson.salary = user_detail.usual_cost
-            else:
-                lesson.salary = C_salary_common
-
+        user_detail = get_user_details(request)
+        lesson.salary = calculate_salary(
+            time, Lesson.objects.filter(date=date).count(),
+            user_detail.usual_cost, user_detail.high_cost
+        )
         lesson.save()
 
-        # self.send_telegram_notice(request.user.pk, date, time)
+        # self.send_telegram_notice(request, date, time)
 
         if lesson.salary == user_detail.high_cost:
             msg = _(
@@ -407,14 +395,15 @@ class AddLessonView(LoginRequiredMixin, CreateView):
         )
         return HttpResponseRedirect(reverse_lazy(self.success_url))
 
-    def send_telegram_notice(self, student_id, date, time):
-        student = User.objects.select_related('details').get(id=student_id)
-        if student.details.alias:
-            username = f"{student.details.alias} ({student.first_name})"
+    def send_telegram_notice(self, request, date, time):
+        user_detail = get_user_details(request)
+        if user_detail.alias:
+            username = f"{user_detail.alias} ({request.user.first_name})"
         else:
-            username = f"{student.first_name}"
+            username = f"{request.user.first_name}"
         method = 'sendMessage'
 
+        import requests  # heavy and rarely used, keeps the startup fast
         response = requests.post(
             url='https://api.telegram.org/bot{0}/{1}'.format(
                 env('TELEGRAM_TOKEN'), method),
@@ -459,6 +448,40 @@ class DeleteLessonView(LoginRequiredMixin, DeleteView):
         return HttpResponseRedirect(success_url)
 
 
+def get_calendar_url(request):
+    """ Absolute url of the calendar feed of the current user """
+
+    return request.build_absolute_uri(reverse_lazy(
+        'calendar_feed_url',
+        kwargs={'token': get_feed_token(request.user)}
+    ))
+
+
+class CalendarFeedView(View):
+    """ iCalendar feed by token. Calendar apps poll it often, so the answer
+    comes from the cache (or 304 by ETag) without database queries """
+
+    def get(self, request, token, *args, **kwargs):
+        feed = read_feed_token(token)
+        if feed is None:
+            raise Http404
+        kind, user_id = feed
+
+        version = get_schedule_version()
+        window = get_booking_window(request)
+        etag = get_feed_etag(kind, user_id, version, window)
+        if etag in request.headers.get('If-None-Match', ''):
+            response = HttpResponse(status=304)
+        else:
+            response = HttpResponse(
+                get_feed(kind, user_id, version, window),
+                content_type='text/calendar; charset=utf-8'
+            )
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, max-age=300'
+        return response
+
+
 class InfoView(View):
     """ All information about me """
 
@@ -507,6 +530,12 @@ class AdminAccessMixin:
         return super().dispatch(request, *args, **kwargs)
 
 
+def get_selected_ids(request, name):
+    """ Ids of the checked rows of a table """
+
+    return [int(pk) for pk in request.POST.getlist(name) if pk.isdigit()]
+
+
 class SettingsAP(AdminAccessMixin, TemplateView):
     title = _('Settings')
     template_name = 'main_app/management/settings.html'
@@ -526,6 +555,7 @@ class SettingsAP(AdminAccessMixin, TemplateView):
         context['C_timedelta'] = C_timedelta_hours + ':' + C_timedelta_minutes
         context['C_datedelta'] = C_datedelta.days
         context['C_lesson_threshold'] = C_lesson_threshold - 1
+        context['calendar_url'] = get_calendar_url(self.request)
         return context
 
 
@@ -544,25 +574,8 @@ class AddLessonAP(AdminAccessMixin, CreateView):
     def get_context_data(self, **kwargs):
         context = {}
 
-        cost_messages = []
-        cost_messages.append(_(
-                "The cost of a usual lesson is {} ₽"
-            ).format(C_salary_common)
-        )
-        cost_messages.append(_(
-                "The cost of a lesson in the early morning to {} is {} ₽."
-            ).format(С_morning_time_markup.strftime(r'%H:%M'), C_salary_high)
-        )
-        cost_messages.append(_(
-                "The cost of a lesson in the late evening to {} is {} ₽."
-            ).format(C_evening_time_markup.strftime(r'%H:%M'), C_salary_high)
-        )
-        cost_messages.append(_(
-                "The cost of a lesson when day is full ({} lessons per day) "
-                "is {} ₽."
-            ).format(C_lesson_threshold - 1, C_salary_high)
-        )
-        context['cost_messages'] = cost_messages
+        context['cost_messages'] = get_cost_messages(C_salary_common,
+                                                     C_salary_high)
 
         context['menu'] = admin_panel
         context['title'] = self.title
@@ -574,23 +587,7 @@ class AddLessonAP(AdminAccessMixin, CreateView):
     def get_form(self, form_class):
         form = super().get_form(form_class)
 
-        student_choices = []
-        students = User.objects.filter(
-            is_staff=False, is_active=True
-        ).select_related('details').order_by('details__alias')
-        for student in students:
-            if student.details.alias:
-                student_choices.append((
-                    student.id,
-                    f"{student.details.alias} ({student.first_name})"
-                ))
-            else:
-                student_choices.append((
-                    student.id,
-                    f"{student.first_name}"
-                ))
-        form.fields['student'].widget.choices = student_choices
-
+        # students are loaded by the page from StudentAutocompleteAPI
         date_choices = get_weekdays()
         form.fields['date'].widget.choices = date_choices
 
@@ -612,35 +609,22 @@ class AddLessonAP(AdminAccessMixin, CreateView):
         ).date()
 
         lesson = self.model()
-        lesson.student_id = form.cleaned_data['student']
-
-        is_morning = С_morning_time <= time < С_morning_time_markup
-        is_evening = C_evening_time_markup < time <= C_evening_time
-        is_over = len(Lesson.objects.filter(date=date)
-                      ) >= C_lesson_threshold - 1
-        # value existence check can be disabled in the future
-        user_detail = UserDetail.objects.get(
-            user_id=form.cleaned_data['student']
-        )
-        if is_morning or is_evening or is_over:
-            if user_detail.high_cost:
-                lesson.salary = user_detail.high_cost
-            else:
-                lesson.salary = C_salary_high
-        else:
-            if user_detail.usual_cost:
-                lesson.salary = user_detail.usual_cost
-            else:
-                lesson.salary = C_salary_common
-
         lesson.time = time
         lesson.date = date
+        lesson.student_id = form.cleaned_data['student']
 
+        usual_cost, high_cost = UserDetail.objects.filter(
+            user_id=lesson.student_id
+        ).values_list('usual_cost', 'high_cost').first() or (None, None)
+        lesson.salary = calculate_salary(
+            time, Lesson.objects.filter(date=date).count(),
+            usual_cost, high_cost
+        )
         lesson.save()
 
         # self.send_telegram_notice(form.cleaned_data['student'], date, time)
 
-        if lesson.salary == user_detail.high_cost:
+        if lesson.salary == high_cost:
             msg = _(
                 "Lesson successfully created. Date: {0}. "
                 "Time: {1}. Cost: {2} ₽. "
@@ -671,6 +655,7 @@ class AddLessonAP(AdminAccessMixin, CreateView):
             username = f"{student.first_name}"
         method = 'sendMessage'
 
+        import requests  # heavy and rarely used, keeps the startup fast
         response = requests.post(
             url='https://api.telegram.org/bot{0}/{1}'.format(
                 env('TELEGRAM_TOKEN'), method),
@@ -693,7 +678,9 @@ class TimeBlockerAP(AdminAccessMixin, FormMixin, ListView):
     form_class = TimeBlockerAPForm
 
     def get_queryset(self):
-        return self.model.objects.filter(date__gte=date.today())
+        return self.model.objects.filter(
+            date__gte=get_booking_window(self.request).start
+        )
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -701,6 +688,7 @@ class TimeBlockerAP(AdminAccessMixin, FormMixin, ListView):
         context['title'] = self.title
         form = self.get_form()
         context['form'] = form
+        context['date_choices'] = form.fields['date'].widget.choices
         return context
 
     def get_form(self):
@@ -712,6 +700,10 @@ class TimeBlockerAP(AdminAccessMixin, FormMixin, ListView):
     def post(self, request, *args, **kwargs):
         if request.POST.get('delete block'):
             return self.remove_block(request)
+        if request.POST.get('delete blocks'):
+            return self.remove_blocks(request)
+        if request.POST.get('cancel lessons'):
+            return self.cancel_day(request)
         form = self.form_class(request.POST)
         if form.is_valid(request):
             return self.form_valid(request, form)
@@ -727,6 +719,23 @@ class TimeBlockerAP(AdminAccessMixin, FormMixin, ListView):
         )
         return redirect(reverse_lazy('time_blocker_AP_url'))
 
+    def remove_blocks(self, request):
+        deleted = delete_blocks(get_selected_ids(request, 'blocks'))
+        messages.success(request, _("Blocks deleted: {}").format(deleted))
+        return redirect(reverse_lazy('time_blocker_AP_url'))
+
+    def cancel_day(self, request):
+        try:
+            day = date.fromisoformat(request.POST.get('date', ''))
+        except ValueError:
+            messages.error(request, _("Date must be YYYY-MM-DD"))
+        else:
+            cancelled = cancel_lessons(day)
+            messages.success(
+                request, _("Lessons cancelled: {}").format(cancelled)
+            )
+        return redirect(reverse_lazy('time_blocker_AP_url'))
+
     def form_valid(self, request, form):
         date = form.cleaned_data['date']
         start_time = form.cleaned_data['start_time']
@@ -749,22 +758,59 @@ class TimeBlockerAP(AdminAccessMixin, FormMixin, ListView):
 
 
 class StudentsAP(AdminAccessMixin, ListView):
-    """ Student list in the admin panel """
+    """ Paginated student list in the admin panel with search by name, alias,
+    phone and telegram (?q=). HTMX requests get the table only """
 
     model = User
     context_object_name = 'students'
     title = _('Students')
     template_name = 'main_app/management/students_info.html'
+    partial_template_name = 'main_app/management/inc/_students_table.html'
+    paginate_by = 50
+    search_fields = {
+        User: ('first_name',),
+        UserDetail: ('alias', 'phone', 'telegram'),
+    }
 
     def get_queryset(self):
-        return self.model.objects.filter(
+        students = self.model.objects.filter(
             is_staff=False
         ).select_related('details').order_by('details__alias', 'first_name')
+        query = self.get_search_query()
+        if query:
+            students = students.filter(self.get_search_condition(query))
+        return students
+
+    def get_search_condition(self, query):
+        """ Ids of the students found by UNION of one lookup per column:
+        PostgreSQL uses a trigram index (migration 0007) for every part.
+        An OR across the join, even by subqueries per table, scans both
+        tables instead: with 100k students EXPLAIN ANALYZE of a search
+        went from parallel seq scans (~245 ms) to bitmap index scans of
+        the four indexes (~12 ms) """
+
+        lookups = [
+            model.objects.filter(**{f'{field}__icontains': query}).values(
+                'pk' if model is self.model else 'user_id'
+            ).order_by()
+            for model, fields in self.search_fields.items()
+            for field in fields
+        ]
+        return Q(pk__in=lookups[0].union(*lookups[1:]))
+
+    def get_search_query(self):
+        return self.request.GET.get('q', '').strip()
+
+    def get_template_names(self):
+        if self.request.headers.get('HX-Request'):
+            return [self.partial_template_name]
+        return super().get_template_names()
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['menu'] = admin_panel
         context['title'] = self.title
+        context['query'] = self.get_search_query()
         return context
 
 
@@ -779,6 +825,10 @@ class StudentDetailAP(AdminAccessMixin, DetailView):
     def post(self, request, *args, **kwargs):
         if request.POST.get('delete lesson'):
             return self.delete_lesson(request)
+        if request.POST.get('shift lessons'):
+            return self.bulk_action(request, shift_lessons, 'days')
+        if request.POST.get('reassign lessons'):
+            return self.bulk_action(request, reassign_lessons, 'student')
         form = self.form_class(request.POST)
         if form.is_valid():
             return self.form_valid(request, form)
@@ -807,7 +857,7 @@ class StudentDetailAP(AdminAccessMixin, DetailView):
 
         context['student_lessons'] = Lesson.objects.filter(
             student_id=user_pk,
-            date__gte=date.today()
+            date__gte=get_booking_window(self.request).start
         )
         context['title'] = StudentsAP.title
         return context
@@ -829,9 +879,19 @@ class StudentDetailAP(AdminAccessMixin, DetailView):
         user.details.save()
         user.save()
         messages.success(request, _('User information changed successfully'))
+        if form.cleaned_data['reprice_lessons']:
+            messages.success(request, _("Lessons repriced: {}").format(
+                reprice_lessons([user.pk])
+            ))
         return redirect(reverse_lazy('student_detail_AP_url',
                                      kwargs={'pk': form.cleaned_data['pk']}))
 
+    def form_invalid(self, form):
+        self.object = self.get_object()
+        context = self.get_context_data(object=self.object)
+        context['form'] = form
+        return self.render_to_response(context)
+
     def delete_lesson(self, request):
         lesson_id = request.POST.get('delete lesson')
         lesson = Lesson.objects.get(pk=lesson_id)
@@ -844,12 +904,95 @@ class StudentDetailAP(AdminAccessMixin, DetailView):
         return redirect(reverse_lazy('student_detail_AP_url',
                                      kwargs={'pk': url_pk}))
 
+    def bulk_action(self, request, action, argument):
+        """ Shift or reassign of the selected lessons """
+
+        value = request.POST.get(argument, '')
+        try:
+            if not value.lstrip('-').isdigit():
+                raise ValueError(_("{} must be a number").format(argument))
+            changed = action(get_selected_ids(request, 'lessons'), int(value))
+        except ValueError as error:
+            messages.error(request, str(error))
+        else:
+            messages.success(
+                request, _("Lessons changed: {}").format(changed)
+            )
+        url_pk = self.kwargs.get(self.pk_url_kwarg)
+        return redirect(reverse_lazy('student_detail_AP_url',
+                                     kwargs={'pk': url_pk}))
+
+
+class ReportsAP(AdminAccessMixin, TemplateView):
+    """ Revenue and occupancy reports in the admin panel """
+
+    title = _('Reports')
+    template_name = 'main_app/management/reports.html'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['menu'] = admin_panel
+        context['title'] = self.title
+
+        month = date.today().replace(day=1)
+        year_ago = month.replace(year=month.year - 1)
+        context['months'] = MonthlySummary.objects.filter(
+            month__gt=year_ago
+        ).order_by('-month')
+        context['days'] = DailySummary.objects.filter(
+            date__gte=month
+        ).order_by('-date')
+        return context
+
+
+class ImportAP(AdminAccessMixin, FormMixin, TemplateView):
+    """ Bulk import of students and lessons from csv in the admin panel """
+
+    title = _('Import')
+    template_name = 'main_app/management/import.html'
+    form_class = ImportAPForm
+    importers = {
+        'students': import_students,
+        'lessons': import_lessons,
+    }
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['menu'] = admin_panel
+        context['title'] = self.title
+        return context
+
+    def post(self, request, *args, **kwargs):
+        form = self.get_form()
+        if not form.is_valid():
+            return self.form_invalid(form)
+
+        try:
+            rows = list(read_csv(form.cleaned_data['file'].read()))
+        except (UnicodeDecodeError, csv.Error):
+            messages.error(request, _("The file must be a csv in UTF-8"))
+            return self.form_invalid(form)
+
+        importer = self.importers[form.cleaned_data['kind']]
+        report = importer(rows, dry_run=form.cleaned_data['dry_run'])
+        if form.cleaned_data['dry_run']:
+            msg = _("{} rows are valid, {} errors")
+        else:
+            msg = _("{} rows imported, {} errors")
+        messages.success(request, msg.format(report.created,
+                                             len(report.errors)))
+        return self.render_to_response(self.get_context_data(
+            form=form, report=report
+        ))
+
 
 admin_panel = [
     (SettingsAP.title, 'settingAP_url'),
     (AddLessonAP.title, 'add_lesson_AP_url'),
     (TimeBlockerAP.title, 'time_blocker_AP_url'),
-    (StudentsAP.title, 'students_AP_url')
+    (StudentsAP.title, 'students_AP_url'),
+    (ReportsAP.title, 'reports_AP_url'),
+    (ImportAP.title, 'import_AP_url')
 ]
 
 
@@ -866,6 +1009,9 @@ class RegistrationAPI(CreateAPIView):
 
     serializer_class = RegistrationSerializer
     permission_classes = [AllowAny]
+    authentication_classes = []
+    throttle_classes = [SlidingWindowThrottle]
+    throttle_scope = 'registration'
 
     def post(self, request, *args, **kwargs):
         return self.create(request, *args, **kwargs)
@@ -931,6 +1077,9 @@ class GetTokenAPI(GenericAPIView):
 
     serializer_class = TokenRequestSerializer
     permission_classes = [AllowAny]
+    authentication_classes = []
+    throttle_classes = [SlidingWindowThrottle]
+    throttle_scope = 'login'
 
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -985,6 +1134,42 @@ class GetTokenAPI(GenericAPIView):
         return token
 
 
+class GetJWTAPI(GetTokenAPI):
+    """ Getting short-lived access and refresh JWT. Requests with
+    the access token are authenticated without database queries """
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        user = self.get_user(
+            phone=serializer.validated_data.get('phone'),
+            telegram=serializer.validated_data.get('telegram')
+        )
+        if user is None:
+            return Response(status=status.HTTP_404_NOT_FOUND)
+
+        refresh = RefreshToken.for_user(user)
+        # copied to the access token, updated on refresh (RefreshJWTAPI)
+        refresh['is_staff'] = user.is_staff
+        token_serializer = ReceivingJWTSerializer(data={
+            'access': str(refresh.access_token),
+            'refresh': str(refresh),
+        })
+        token_serializer.is_valid()
+
+        return Response(
+            token_serializer.data,
+            status=status.HTTP_200_OK
+        )
+
+
+class RefreshJWTAPI(TokenRefreshView):
+    """ Getting a new access JWT by the refresh one for active users """
+
+    serializer_class = RefreshJWTSerializer
+
+
 class DeleteUserAPI(DestroyAPIView):
     """ Delete user """
 
@@ -1014,7 +1199,7 @@ class RelevantLessonsAPI(ListAPIView):
 
     def get_queryset(self):
         queryset = Lesson.objects.filter(
-            date__gte=date.today()
+            date__gte=get_booking_window(self.request).start
         )
         return queryset
 
@@ -1023,48 +1208,121 @@ class LessonsViewSet(viewsets.ModelViewSet):
     """ ViewSet of own relevant lessons for authenticated user.
     Request type: GET, POST, PUT, PATCH, DELETE """
 
-    queryset = Lesson.objects.filter(date__gte=date.today())
+    queryset = Lesson.objects.all()
     serializer_class = LessonSerializer
     permission_classes = [IsAuthenticated]
 
+    def get_queryset(self):
+        return super().get_queryset().filter(
+            date__gte=get_booking_window(self.request).start
+        )
+
     def perform_create(self, serializer):
         time = serializer.validated_data['time']
         date = serializer.validated_data['date']
-        is_morning = С_morning_time <= time < С_morning_time_markup
-        is_evening = C_evening_time_markup < time <= C_evening_time
-        is_over = len(Lesson.objects.filter(date=date)
-                      ) >= C_lesson_threshold - 1
-        # value existence check can be disabled in the future
-        user_detail = UserDetail.objects.get(user_id=self.request.user.id)
-        if is_morning or is_evening or is_over:
-            if user_detail.high_cost:
-                salary = user_detail.high_cost
-            else:
-                salary = C_salary_high
-        else:
-            if user_detail.usual_cost:
-                salary = user_detail.usual_cost
-            else:
-                salary = C_salary_common
+        user_detail = get_user_details(self.request)
+        salary = calculate_salary(
+            time, Lesson.objects.filter(date=date).count(),
+            user_detail.usual_cost, user_detail.high_cost
+        )
 
         serializer.save(student_id=self.request.user.pk, salary=salary)
 
 
 class LessonsAdminViewSet(viewsets.ModelViewSet):
-    """ ViewSet of all lessons """
+    """ ViewSet of all lessons. The list includes archived lessons """
 
     queryset = Lesson.objects.all()
     serializer_class = LessonAdminSerializer
     permission_classes = [IsAdminUser]
 
+    def list(self, request, *args, **kwargs):
+        serializer = self.get_serializer(lesson_history(), many=True)
+        return Response(serializer.data)
+
+    @action(detail=False, methods=['post'],
+            serializer_class=LessonsCancelSerializer)
+    def cancel(self, request, *args, **kwargs):
+        """ Cancel of all lessons of the date. Data: {"date": "YYYY-MM-DD"} """
+
+        data = self.get_valid_data(request)
+        return Response({'lessons': cancel_lessons(data['date'])})
+
+    @action(detail=False, methods=['post'],
+            serializer_class=LessonsShiftSerializer)
+    def shift(self, request, *args, **kwargs):
+        """ Move of lessons. Data: {"lessons": [<id>], "days": <amount>} """
+
+        data = self.get_valid_data(request)
+        return self.run_bulk_action(shift_lessons, data['lessons'],
+                                    data['days'])
+
+    @action(detail=False, methods=['post'],
+            serializer_class=LessonsReassignSerializer)
+    def reassign(self, request, *args, **kwargs):
+        """ Reassign of lessons. Data: {"lessons": [<id>], "student": <id>} """
+
+        data = self.get_valid_data(request)
+        return self.run_bulk_action(reassign_lessons, data['lessons'],
+                                    data['student'])
+
+    def get_valid_data(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data
+
+    def run_bulk_action(self, function, *args):
+        try:
+            return Response({'lessons': function(*args)})
+        except ValueError as error:
+            raise ValidationError(str(error))
+
 
 class RelevantLessonsAdminViewSet(viewsets.ModelViewSet):
     """ ViewSet of all relevant lessons """
 
-    queryset = Lesson.objects.filter(date__gte=date.today())
+    queryset = Lesson.objects.all()
     serializer_class = LessonAdminSerializer
     permission_classes = [IsAdminUser]
 
+    def get_queryset(self):
+        return super().get_queryset().filter(
+            date__gte=get_booking_window(self.request).start
+        )
+
+
+class LessonsExportAPI(APIView):
+    """ Streaming export of the lesson history (csv or ndjson).
+    Query params: date_from=YYYY-MM-DD, date_to=YYYY-MM-DD, student=<id> """
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, export_format, *args, **kwargs):
+        if export_format not in EXPORT_FORMATS:
+            raise Http404
+        generator, content_type = EXPORT_FORMATS[export_format]
+
+        filters = {}
+        for param in ('date_from', 'date_to'):
+            value = request.query_params.get(param)
+            try:
+                filters[param] = date.fromisoformat(value) if value else None
+            except ValueError:
+                raise ValidationError({param: _("Date must be YYYY-MM-DD")})
+        student = request.query_params.get('student')
+        if student and not student.isdigit():
+            raise ValidationError({'student': _("Student must be an id")})
+        filters['student_id'] = student
+
+        response = StreamingHttpResponse(
+            generator(get_export_queryset(**filters)),
+            content_type=content_type
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="lessons.{export_format}"'
+        )
+        return response
+
 
 #################################################################
 #                      ADMIN PANEL (AP) API                     #
@@ -1074,21 +1332,38 @@ class RelevantLessonsAdminViewSet(viewsets.ModelViewSet):
 class TimeBlockAPI(ListAPIView):
     """ Getting block list """
 
-    queryset = TimeBlock.objects.filter(
-        date__gte=date.today(),
-        date__lte=date.today() + C_datedelta
-    )
+    queryset = TimeBlock.objects.all()
     serializer_class = TimeBlockSerializer
     permission_classes = [AllowAny]
 
+    def get_queryset(self):
+        start, end = get_booking_window(self.request)
+        return super().get_queryset().filter(date__gte=start, date__lte=end)
+
 
 class TimeBlockAdminAPI(viewsets.ModelViewSet):
     """ ViewSet of all future Timeblocks for admin """
 
-    queryset = TimeBlock.objects.filter(date__gte=date.today())
+    queryset = TimeBlock.objects.all()
     serializer_class = TimeBlockAdminSerializer
     permission_classes = [IsAdminUser]
 
+    def get_queryset(self):
+        return super().get_queryset().filter(
+            date__gte=get_booking_window(self.request).start
+        )
+
+    @action(detail=False, methods=['post'], url_path='bulk-delete',
+            serializer_class=TimeBlocksDeleteSerializer)
+    def bulk_delete(self, request, *args, **kwargs):
+        """ Delete of time blocks. Data: {"blocks": [<id>]} """
+
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return Response({
+            'blocks': delete_blocks(serializer.validated_data['blocks'])
+        })
+
 
 class StudentAdminAPI(mixins.RetrieveModelMixin,
                       mixins.UpdateModelMixin,
@@ -1100,6 +1375,72 @@ class StudentAdminAPI(mixins.RetrieveModelMixin,
     serializer_class = StudentAdminSerializer
     permission_classes = [IsAdminUser]
 
+    @action(detail=False, methods=['post'],
+            serializer_class=LessonsRepriceSerializer)
+    def reprice(self, request, *args, **kwargs):
+        """ Recalculation of salaries of future lessons by the current costs
+        of the students. Data: {"students": [<id>]} """
+
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return Response({
+            'lessons': reprice_lessons(serializer.validated_data['students'])
+        })
+
+
+class StudentAutocompleteAPI(APIView):
+    """ Active students by prefix of alias, name, phone or telegram.
+    Query params: q=<prefix>, limit=<amount> (10 by default, 50 at most) """
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        limit = request.query_params.get('limit', '')
+        limit = min(int(limit), 50) if limit.isdigit() else AUTOCOMPLETE_LIMIT
+        return Response([
+            {'id': pk, 'label': label}
+            for pk, label in search_students(
+                request.query_params.get('q', ''), limit
+            )
+        ])
+
+
+class ReportsAdminAPI(ListAPIView):
+    """ Revenue and occupancy reports for admin.
+    Query params: period=day|month, start=YYYY-MM-DD, end=YYYY-MM-DD """
+
+    permission_classes = [IsAdminUser]
+
+    def get_serializer_class(self):
+        if self.get_period() == 'month':
+            return MonthlySummarySerializer
+        return DailySummarySerializer
+
+    def get_period(self):
+        period = self.request.query_params.get('period', 'day')
+        if period not in ('day', 'month'):
+            raise ValidationError({'period': _("Period must be day or month")})
+        return period
+
+    def get_queryset(self):
+        if self.get_period() == 'month':
+            queryset, field = MonthlySummary.objects.all(), 'month'
+        else:
+            queryset, field = DailySummary.objects.all(), 'date'
+
+        for param, lookup in (('start', 'gte'), ('end', 'lte')):
+            value = self.request.query_params.get(param)
+            if not value:
+                continue
+            try:
+                value = date.fromisoformat(value)
+            except ValueError:
+                raise ValidationError({param: _("Date must be YYYY-MM-DD")})
+            if field == 'month':
+                value = value.replace(day=1)
+            queryset = queryset.filter(**{f'{field}__{lookup}': value})
+        return queryset
+
 #################################################################
 #                    END ADMIN PANEL (AP) API                   #
 #################################################################
@@ -1122,14 +1463,12 @@ class NoticeByUserAPI(mixins.RetrieveModelMixin,
         if not ((new_notice is False) or (new_notice is True)):
             return Response({"error": "Wrong value"})
 
-        pk = request.user.pk
-        try:
-            instance = User.objects.select_related('details').get(pk=pk)
-        except BaseException:
+        user_detail = get_user_details(request)
+        if user_detail is None:
             return Response({"error": "Object does not exists"})
 
-        instance.details.notice = new_notice
-        instance.details.save()
+        user_detail.notice = new_notice
+        user_detail.save(update_fields=['notice'])
         if new_notice:
             return Response("Notification works")
         else:
@@ -0,0 +1,29 @@
+""" SQLite backend with the production profile.
+
+OPTIONS of the database may contain (besides sqlite3.connect() arguments):
+    'pragmas': {'journal_mode': 'WAL', ...} - executed on every new connection
+    'transaction_mode': 'IMMEDIATE' - transactions (atomic blocks) take the
+        write lock at BEGIN, so concurrent writers wait for busy_timeout
+        instead of failing with "database is locked" on the lock upgrade """
+
+from django.db.backends.sqlite3 import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        params.pop('pragmas', None)
+        params.pop('transaction_mode', None)
+        return params
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        pragmas = self.settings_dict['OPTIONS'].get('pragmas', {})
+        for pragma, value in pragmas.items():
+            conn.execute(f'PRAGMA {pragma} = {value}')
+        return conn
+
+    def _start_transaction_under_autocommit(self):
+        mode = self.settings_dict['OPTIONS'].get('transaction_mode', '')
+        self.cursor().execute(f'BEGIN {mode}'.strip())
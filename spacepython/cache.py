@@ -0,0 +1,149 @@
+""" Two-tier cache backend.
+
+A small per-process LRU with TTL sits in front of the shared cache (Redis or
+memcached given by CACHE_URL, local memory in development and tests). Reads
+are served from the process memory when possible, writes go through to the
+shared cache. A local entry lives at most LOCAL_TIMEOUT seconds, which bounds
+how long other processes may see an old value.
+
+    'default': {
+        'BACKEND': 'spacepython.cache.TieredCache',
+        'OPTIONS': {
+            'SHARED': 'shared',  # alias of the shared cache in CACHES
+            'LOCAL_MAX_ENTRIES': 1000,
+            'LOCAL_TIMEOUT': 5,
+        },
+    }
+
+get_stats() returns hit and miss counters of the current process. """
+
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+
+_MISSING = object()
+
+
+class TieredCache(BaseCache):
+
+    def __init__(self, location, params):
+        options = params.get('OPTIONS', {})
+        super().__init__(params)
+        self._shared_alias = options.get('SHARED', 'shared')
+        self._local_max_entries = int(options.get('LOCAL_MAX_ENTRIES', 1000))
+        self._local_timeout = float(options.get('LOCAL_TIMEOUT', 5))
+        self._local = OrderedDict()  # key: (expiry, pickled value)
+        self._lock = threading.Lock()
+        self._stats = {'local_hits': 0, 'shared_hits': 0, 'misses': 0}
+
+    @property
+    def shared(self):
+        return caches[self._shared_alias]
+
+    # local tier
+
+    def _local_get(self, key):
+        with self._lock:
+            item = self._local.get(key)
+            if item is None:
+                return _MISSING
+            expiry, pickled = item
+            if expiry <= time.monotonic():
+                del self._local[key]
+                return _MISSING
+            self._local.move_to_end(key)
+            self._stats['local_hits'] += 1
+        return pickle.loads(pickled)
+
+    def _local_set(self, key, value, timeout=DEFAULT_TIMEOUT):
+        expiry = time.monotonic() + self._local_timeout
+        if timeout is not DEFAULT_TIMEOUT and timeout is not None:
+            if timeout <= 0:
+                self._local_delete(key)
+                return
+            expiry = min(expiry, time.monotonic() + timeout)
+        pickled = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._local[key] = (expiry, pickled)
+            self._local.move_to_end(key)
+            while len(self._local) > self._local_max_entries:
+                self._local.popitem(last=False)
+
+    def _local_delete(self, key):
+        with self._lock:
+            self._local.pop(key, None)
+
+    # cache API
+
+    def get(self, key, default=None, version=None):
+        local_key = self.make_and_validate_key(key, version=version)
+        value = self._local_get(local_key)
+        if value is not _MISSING:
+            return value
+        value = self.shared.get(key, _MISSING, version=version)
+        if value is _MISSING:
+            self._count('misses')
+            return default
+        self._count('shared_hits')
+        self._local_set(local_key, value)
+        return value
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.shared.set(key, value, timeout, version=version)
+        self._local_set(self.make_and_validate_key(key, version=version),
+                        value, timeout)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        added = self.shared.add(key, value, timeout, version=version)
+        if added:
+            self._local_set(self.make_and_validate_key(key, version=version),
+                            value, timeout)
+        return added
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.shared.touch(key, timeout, version=version)
+
+    def delete(self, key, version=None):
+        self._local_delete(self.make_and_validate_key(key, version=version))
+        return self.shared.delete(key, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        value = self.shared.incr(key, delta, version=version)
+        self._local_set(self.make_and_validate_key(key, version=version),
+                        value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._local.clear()
+        self.shared.clear()
+
+    def close(self, **kwargs):
+        self.shared.close(**kwargs)
+
+    # instrumentation (gthread workers: the counters are changed under
+    # the lock, has_key() of BaseCache goes through get())
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self._stats, local_entries=len(self._local))
+        requests = stats['local_hits'] + stats['shared_hits'] + stats['misses']
+        stats['hit_rate'] = (
+            (stats['local_hits'] + stats['shared_hits']) / requests
+            if requests else 0.0
+        )
+        return stats
+
+    def reset_stats(self):
+        with self._lock:
+            for name in self._stats:
+                self._stats[name] = 0
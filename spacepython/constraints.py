@@ -13,3 +13,5 @@ C_timedelta = datetime.timedelta(hours=3)  # students need to book lessons in ad
 C_datedelta = datetime.timedelta(days=7)  # unable to sign up for lessons too early
 
 C_lesson_threshold = 5  # >= this value a lesson cost will be higher
+
+C_lesson_duration = datetime.timedelta(hours=1)  # every lesson takes one hour
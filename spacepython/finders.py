@@ -0,0 +1,17 @@
+""" Static files finder which skips apps from STATICFILES_EXCLUDED_APPS
+(e.g. rest_framework: assets of the browsable API aren't needed without it) """
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.staticfiles import finders
+
+
+class AppDirectoriesFinder(finders.AppDirectoriesFinder):
+
+    def __init__(self, app_names=None, *args, **kwargs):
+        excluded = set(getattr(settings, 'STATICFILES_EXCLUDED_APPS', []))
+        if app_names is None:
+            app_names = [app_config.name
+                         for app_config in apps.get_app_configs()]
+        app_names = [name for name in app_names if name not in excluded]
+        super().__init__(app_names, *args, **kwargs)
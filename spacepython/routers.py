@@ -0,0 +1,78 @@
+""" Routing of reads to the read replica (DATABASES['replica']).
+
+Only safe requests (GET, HEAD, OPTIONS) read from the replica, everything
+else (management commands, signals, transactions, tests) uses the primary.
+Read-your-writes: after the first write the rest of the request reads from
+the primary and the client gets a cookie which pins its following requests
+to the primary for DATABASE_REPLICA_PIN_SECONDS (replication lag). """
+
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+REPLICA_DB_ALIAS = 'replica'
+PIN_COOKIE = 'db_primary'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# None - not in a request, 'replica' - reads may go to the replica,
+# 'primary' - the request has written (or is pinned)
+_routing = ContextVar('db_routing', default=None)
+
+
+def replica_enabled():
+    return REPLICA_DB_ALIAS in settings.DATABASES
+
+
+class PrimaryReplicaRouter:
+    """ Reads from the replica when the current request allows it """
+
+    def db_for_read(self, model, **hints):
+        if (_routing.get() == 'replica'
+                and not connections[DEFAULT_DB_ALIAS].in_atomic_block):
+            return REPLICA_DB_ALIAS
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        if _routing.get() == 'replica':
+            _routing.set('primary')
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # both aliases are the same database
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReplicaRoutingMiddleware:
+    """ Allows replica reads for safe requests of not pinned clients and pins
+    clients which have written """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not replica_enabled():
+            return self.get_response(request)
+
+        use_replica = (request.method in SAFE_METHODS
+                       and PIN_COOKIE not in request.COOKIES)
+        token = _routing.set('replica' if use_replica else 'primary')
+        try:
+            response = self.get_response(request)
+            wrote = _routing.get() == 'primary' and (
+                use_replica or request.method not in SAFE_METHODS
+            )
+        finally:
+            _routing.reset(token)
+
+        if wrote:
+            response.set_cookie(
+                PIN_COOKIE, '1',
+                max_age=settings.DATABASE_REPLICA_PIN_SECONDS,
+                httponly=True, samesite='Lax',
+            )
+        return response
@@ -0,0 +1,28 @@
+// Fills the "student" select of forms with the "student-autocomplete" class
+// from the autocomplete API (data-autocomplete-url) by the "filter" input
+
+function updateStudentList(form) {
+    let request = form.lastRequest = (form.lastRequest || 0) + 1
+    let filter = encodeURIComponent(form.filter.value)
+    fetch(`${form.dataset.autocompleteUrl}?q=${filter}&limit=50`, {credentials: 'same-origin'})
+        .then(response => response.json())
+        .then(students => {
+            if (request != form.lastRequest) {
+                return  // an answer to an old filter
+            }
+            let select = form.student
+            select.options.length = 0
+            for (let student of students) {
+                select.add(new Option(student.label, student.id))
+            }
+            // select alone option
+            select.options.selectedIndex = select.length == 1 ? 0 : -1
+        })
+}
+
+for (let form of document.querySelectorAll('.student-autocomplete')) {
+    form.filter.addEventListener("input", function (event) {
+        updateStudentList(form)
+    })
+    updateStudentList(form)
+}
@@ -1,6 +1,8 @@
 from django.conf import settings
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, re_path, include
+
+from main_app.views import RefreshJWTAPI
 
 
 urlpatterns = [
@@ -9,6 +11,8 @@ urlpatterns = [
     path('', include('main_app.urls')),
     # path('auth/', include('djoser.urls')),
     # path('auth/', include('djoser.urls.authtoken')),
+    # the refresh of djoser doesn't check the user
+    re_path(r'^auth/jwt/refresh/?', RefreshJWTAPI.as_view()),
     path('auth/', include('djoser.urls.jwt')),
 ]
 
@@ -0,0 +1,70 @@
+""" Warmup of a server process before the first request (see gunicorn.conf.py).
+
+warmup_app() runs in the gunicorn master after the preload of the app, so
+workers get compiled templates and loaded translations by fork. It mustn't
+open database or cache connections, they can't be shared between processes.
+warmup_connections() runs in every worker thread, because Django keeps
+connections per thread. """
+
+import logging
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+from django.template import engines
+from django.utils import translation
+
+
+logger = logging.getLogger('gunicorn.error')
+
+
+def warmup_app():
+    started = time.monotonic()
+    templates = warmup_templates()
+    warmup_translations()
+    logger.info('Warmup: %s templates compiled in %.2fs', templates,
+                time.monotonic() - started)
+
+
+def warmup_templates():
+    """ Compiles all templates into the cached loader, returns the amount """
+
+    compiled = 0
+    for engine in engines.all():
+        for directory in map(Path, _get_template_dirs(engine.engine)):
+            for path in directory.rglob('*.html'):
+                try:
+                    engine.get_template(
+                        path.relative_to(directory).as_posix()
+                    )
+                except Exception:
+                    # e.g. templates with tags of not installed apps
+                    continue
+                compiled += 1
+    return compiled
+
+
+def _get_template_dirs(engine):
+    dirs = []
+    for loader in engine.template_loaders:
+        for inner_loader in getattr(loader, 'loaders', [loader]):
+            dirs.extend(inner_loader.get_dirs())
+    return dirs
+
+
+def warmup_translations():
+    with translation.override(settings.LANGUAGE_CODE):
+        translation.gettext('')
+
+
+def warmup_connections():
+    """ Opens the database connections of the current thread and
+    the cache connections. The database ones are reused by requests only
+    with CONN_MAX_AGE > 0, otherwise the first request closes them """
+
+    for connection in connections.all():
+        connection.ensure_connection()
+    for cache in caches.all():
+        cache.get('warmup')